@@ -0,0 +1,40 @@
+"""Сравнение сериализаторов кэша на списке меню из нескольких сотен строк.
+
+Запуск: python -m benchmarks.cache_serializers
+"""
+import json
+import timeit
+import uuid
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.engine.result import result_tuple
+
+from restaurant_menu_app.db.cache.serializers import SERIALIZERS
+
+ROWS_COUNT = 500
+REPEAT = 200
+
+MenuRow = result_tuple(["id", "title", "description", "submenus_count", "dishes_count"])
+menus = [MenuRow((uuid.uuid4(), f"Menu {i}", f"Menu {i} description", 7, 77)) for i in range(ROWS_COUNT)]
+
+
+def current_path():
+    return json.loads(json.dumps(jsonable_encoder(menus)))
+
+
+def main():
+    baseline = timeit.timeit(current_path, number=REPEAT) / REPEAT
+    print(f"{'jsonable_encoder + json':<25}{baseline * 1000:>10.3f} ms")
+
+    for name, serializer_class in SERIALIZERS.items():
+        try:
+            serializer = serializer_class()
+        except ImportError:
+            print(f"{name:<25}{'not installed':>13}")
+            continue
+        elapsed = timeit.timeit(lambda: serializer.loads(serializer.dumps(menus)), number=REPEAT) / REPEAT
+        print(f"{name:<25}{elapsed * 1000:>10.3f} ms  x{baseline / elapsed:.1f}")
+
+
+if __name__ == "__main__":
+    main()
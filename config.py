@@ -9,13 +9,48 @@ DB_PORT = os.environ.get("DB_PORT")
 DB_NAME = os.environ.get("DB_NAME")
 DB_USER = os.environ.get("DB_USER")
 DB_PASS = os.environ.get("DB_PASS")
+DB_ECHO = os.environ.get("DB_ECHO", "false").lower() == "true"
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT = float(os.environ.get("DB_POOL_TIMEOUT", 30))
+DB_POOL_RECYCLE = int(os.environ.get("DB_POOL_RECYCLE", 1800))
+DB_POOL_PRE_PING = os.environ.get("DB_POOL_PRE_PING", "true").lower() == "true"
+DB_STATEMENT_CACHE_SIZE = int(os.environ.get("DB_STATEMENT_CACHE_SIZE", 100))
+DB_NULL_POOL = os.environ.get("DB_NULL_POOL", "false").lower() == "true"
+DB_REPLICA_HOST = os.environ.get("DB_REPLICA_HOST")
+DB_REPLICA_PORT = os.environ.get("DB_REPLICA_PORT", DB_PORT)
+DB_PRIMARY_PIN_SECONDS = int(os.environ.get("DB_PRIMARY_PIN_SECONDS", 5))
 
 TEST_DB_NAME = os.environ.get("TEST_DB_NAME")
 
 REDIS_HOST = os.environ.get("REDIS_HOST")
-REDIS_PORT = os.environ.get("REDIS_PORT")
+REDIS_PORT = os.environ.get("REDIS_PORT", 6379)
 REDIS_DB = os.environ.get("REDIS_DB")
 REDIS_EXP = int(os.environ.get("REDIS_EXP", 100))
+REDIS_MAX_CONNECTIONS = int(os.environ.get("REDIS_MAX_CONNECTIONS", 50))
+REDIS_POOL_TIMEOUT = float(os.environ.get("REDIS_POOL_TIMEOUT", 1))
+REDIS_SOCKET_TIMEOUT = float(os.environ.get("REDIS_SOCKET_TIMEOUT", 0.5))
+REDIS_CONNECT_TIMEOUT = float(os.environ.get("REDIS_CONNECT_TIMEOUT", 0.5))
+REDIS_HEALTH_CHECK_INTERVAL = int(os.environ.get("REDIS_HEALTH_CHECK_INTERVAL", 30))
+CACHE_FAILURE_THRESHOLD = int(os.environ.get("CACHE_FAILURE_THRESHOLD", 5))
+CACHE_RESET_TIMEOUT = float(os.environ.get("CACHE_RESET_TIMEOUT", 10))
+CACHE_WARM_UP = os.environ.get("CACHE_WARM_UP", "false").lower() == "true"
+CACHE_STALE_TIME = int(os.environ.get("CACHE_STALE_TIME", 0))
+CACHE_LOCK_TIMEOUT = int(os.environ.get("CACHE_LOCK_TIMEOUT", 10))
+CACHE_EARLY_REFRESH_BETA = float(os.environ.get("CACHE_EARLY_REFRESH_BETA", 0))
+CACHE_SERIALIZER = os.environ.get("CACHE_SERIALIZER", "json")
+LOCAL_CACHE_ENABLED = os.environ.get("LOCAL_CACHE_ENABLED", "false").lower() == "true"
+LOCAL_CACHE_MAX_SIZE = int(os.environ.get("LOCAL_CACHE_MAX_SIZE", 1024))
+LOCAL_CACHE_EXP = int(os.environ.get("LOCAL_CACHE_EXP", 5))
+PAGE_SIZE = int(os.environ.get("PAGE_SIZE", 50))
+MAX_PAGE_SIZE = int(os.environ.get("MAX_PAGE_SIZE", 500))
+MAX_BULK_SIZE = int(os.environ.get("MAX_BULK_SIZE", 1000))
+SEED_CHUNK_SIZE = int(os.environ.get("SEED_CHUNK_SIZE", 5000))
+SEED_MAX_DISHES = int(os.environ.get("SEED_MAX_DISHES", 200_000))
+EXPORT_BATCH_SIZE = int(os.environ.get("EXPORT_BATCH_SIZE", 1000))
+EXPORT_KEEP_FILES = int(os.environ.get("EXPORT_KEEP_FILES", 3))
+EXPORT_CACHE_TIME = int(os.environ.get("EXPORT_CACHE_TIME", 86400))
+EXPORT_STREAM_MAX_DISHES = int(os.environ.get("EXPORT_STREAM_MAX_DISHES", 20_000))
 RABBITMQ_USER = os.environ.get("RABBITMQ_USER")
 RABBITMQ_PASSWORD = os.environ.get("RABBITMQ_PASSWORD")
 RABBITMQ_HOST = os.environ.get("RABBITMQ_HOST")
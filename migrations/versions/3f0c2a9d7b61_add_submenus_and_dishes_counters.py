@@ -0,0 +1,98 @@
+"""Add submenus and dishes counters
+
+Revision ID: 3f0c2a9d7b61
+Revises: e986f6461966
+Create Date: 2023-02-20 18:42:11.204517
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f0c2a9d7b61'
+down_revision = 'e986f6461966'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('menus', sa.Column('submenus_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('menus', sa.Column('dishes_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('submenus', sa.Column('dishes_count', sa.Integer(), server_default='0', nullable=False))
+
+    op.execute("""
+        UPDATE submenus
+        SET dishes_count = counts.dishes_count
+        FROM (
+            SELECT submenu_id, count(*) AS dishes_count FROM dishes GROUP BY submenu_id
+        ) AS counts
+        WHERE submenus.id = counts.submenu_id
+    """)
+    op.execute("""
+        UPDATE menus
+        SET submenus_count = counts.submenus_count, dishes_count = counts.dishes_count
+        FROM (
+            SELECT menu_id, count(*) AS submenus_count, sum(dishes_count) AS dishes_count
+            FROM submenus
+            GROUP BY menu_id
+        ) AS counts
+        WHERE menus.id = counts.menu_id
+    """)
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION submenus_counter() RETURNS trigger AS $$
+        BEGIN
+            IF current_setting('app.bulk_load', true) = 'on' THEN
+                RETURN NULL;
+            END IF;
+            IF TG_OP = 'INSERT' THEN
+                UPDATE menus SET submenus_count = submenus_count + 1 WHERE id = NEW.menu_id;
+                RETURN NEW;
+            END IF;
+            UPDATE menus
+            SET submenus_count = submenus_count - 1, dishes_count = dishes_count - OLD.dishes_count
+            WHERE id = OLD.menu_id;
+            RETURN OLD;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER submenus_counter AFTER INSERT OR DELETE ON submenus
+        FOR EACH ROW EXECUTE FUNCTION submenus_counter()
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION dishes_counter() RETURNS trigger AS $$
+        DECLARE
+            parent_menu_id UUID;
+        BEGIN
+            IF current_setting('app.bulk_load', true) = 'on' THEN
+                RETURN NULL;
+            END IF;
+            IF TG_OP = 'INSERT' THEN
+                UPDATE submenus SET dishes_count = dishes_count + 1 WHERE id = NEW.submenu_id
+                RETURNING menu_id INTO parent_menu_id;
+                UPDATE menus SET dishes_count = dishes_count + 1 WHERE id = parent_menu_id;
+                RETURN NEW;
+            END IF;
+            UPDATE submenus SET dishes_count = dishes_count - 1 WHERE id = OLD.submenu_id
+            RETURNING menu_id INTO parent_menu_id;
+            UPDATE menus SET dishes_count = dishes_count - 1 WHERE id = parent_menu_id;
+            RETURN OLD;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER dishes_counter AFTER INSERT OR DELETE ON dishes
+        FOR EACH ROW EXECUTE FUNCTION dishes_counter()
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS dishes_counter ON dishes")
+    op.execute("DROP FUNCTION IF EXISTS dishes_counter()")
+    op.execute("DROP TRIGGER IF EXISTS submenus_counter ON submenus")
+    op.execute("DROP FUNCTION IF EXISTS submenus_counter()")
+    op.drop_column('submenus', 'dishes_count')
+    op.drop_column('menus', 'dishes_count')
+    op.drop_column('menus', 'submenus_count')
@@ -0,0 +1,44 @@
+"""Replace id indexes with foreign key indexes
+
+Revision ID: 8b4e6d1f0a92
+Revises: 3f0c2a9d7b61
+Create Date: 2023-02-21 12:07:38.641093
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b4e6d1f0a92'
+down_revision = '3f0c2a9d7b61'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.drop_index(op.f('ix_submenus_id'), table_name='submenus')
+    op.drop_index(op.f('ix_menus_id'), table_name='menus')
+    op.drop_index(op.f('ix_dishes_id'), table_name='dishes')
+    op.create_index(
+        'ix_submenus_menu_id',
+        'submenus',
+        ['menu_id'],
+        unique=False,
+        postgresql_include=['id', 'title', 'description', 'dishes_count'],
+    )
+    op.create_index(
+        'ix_dishes_submenu_id',
+        'dishes',
+        ['submenu_id'],
+        unique=False,
+        postgresql_include=['id', 'title', 'description', 'price'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_dishes_submenu_id', table_name='dishes')
+    op.drop_index('ix_submenus_menu_id', table_name='submenus')
+    op.create_index(op.f('ix_dishes_id'), 'dishes', ['id'], unique=False)
+    op.create_index(op.f('ix_menus_id'), 'menus', ['id'], unique=False)
+    op.create_index(op.f('ix_submenus_id'), 'submenus', ['id'], unique=False)
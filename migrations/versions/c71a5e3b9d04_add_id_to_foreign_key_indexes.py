@@ -0,0 +1,54 @@
+"""Add id to foreign key indexes for keyset pagination
+
+Revision ID: c71a5e3b9d04
+Revises: 8b4e6d1f0a92
+Create Date: 2023-02-22 10:15:04.318276
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c71a5e3b9d04'
+down_revision = '8b4e6d1f0a92'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.drop_index('ix_dishes_submenu_id', table_name='dishes')
+    op.drop_index('ix_submenus_menu_id', table_name='submenus')
+    op.create_index(
+        'ix_submenus_menu_id',
+        'submenus',
+        ['menu_id', 'id'],
+        unique=False,
+        postgresql_include=['title', 'description', 'dishes_count'],
+    )
+    op.create_index(
+        'ix_dishes_submenu_id',
+        'dishes',
+        ['submenu_id', 'id'],
+        unique=False,
+        postgresql_include=['title', 'description', 'price'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_dishes_submenu_id', table_name='dishes')
+    op.drop_index('ix_submenus_menu_id', table_name='submenus')
+    op.create_index(
+        'ix_submenus_menu_id',
+        'submenus',
+        ['menu_id'],
+        unique=False,
+        postgresql_include=['id', 'title', 'description', 'dishes_count'],
+    )
+    op.create_index(
+        'ix_dishes_submenu_id',
+        'dishes',
+        ['submenu_id'],
+        unique=False,
+        postgresql_include=['id', 'title', 'description', 'price'],
+    )
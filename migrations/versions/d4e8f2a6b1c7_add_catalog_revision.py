@@ -0,0 +1,63 @@
+"""Add catalog revision
+
+Revision ID: d4e8f2a6b1c7
+Revises: c71a5e3b9d04
+Create Date: 2023-02-24 12:08:37.551902
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4e8f2a6b1c7'
+down_revision = 'c71a5e3b9d04'
+branch_labels = None
+depends_on = None
+
+TABLES = ('menus', 'submenus', 'dishes')
+EVENTS = {
+    'INSERT': 'REFERENCING NEW TABLE AS changed_rows',
+    'UPDATE': 'REFERENCING NEW TABLE AS changed_rows',
+    'DELETE': 'REFERENCING OLD TABLE AS changed_rows',
+    'TRUNCATE': '',
+}
+
+
+def upgrade() -> None:
+    op.create_table(
+        'catalog_revision',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('revision', sa.BigInteger(), server_default='0', nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.execute("INSERT INTO catalog_revision (id, revision) VALUES (1, 0)")
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_catalog_revision() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP <> 'TRUNCATE' THEN
+                IF NOT EXISTS (SELECT FROM changed_rows) THEN
+                    RETURN NULL;
+                END IF;
+            END IF;
+            UPDATE catalog_revision SET revision = revision + 1 WHERE id = 1;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    for table in TABLES:
+        for trigger_event, referencing in EVENTS.items():
+            op.execute(f"""
+                CREATE TRIGGER {table}_catalog_revision_{trigger_event.lower()}
+                AFTER {trigger_event} ON {table} {referencing}
+                FOR EACH STATEMENT EXECUTE FUNCTION bump_catalog_revision()
+            """)
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        for trigger_event in EVENTS:
+            op.execute(f"DROP TRIGGER IF EXISTS {table}_catalog_revision_{trigger_event.lower()} ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS bump_catalog_revision()")
+    op.drop_table('catalog_revision')
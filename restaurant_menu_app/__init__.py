@@ -1,4 +1,4 @@
-from .models.model import Menu, Submenu, Dish
+from .models.model import Menu, Submenu, Dish, CatalogRevision
 from .db.main_db.database import Base
 
-__all__ = ["Base", "Menu", "Submenu", "Dish"]
+__all__ = ["Base", "Menu", "Submenu", "Dish", "CatalogRevision"]
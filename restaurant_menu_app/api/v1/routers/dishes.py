@@ -1,9 +1,18 @@
 from http import HTTPStatus
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Body, Depends, Query, Response
 
-from restaurant_menu_app.schemas.scheme import DishCreate, DishInfo, DishUpdate, Message
+from config import MAX_BULK_SIZE, MAX_PAGE_SIZE, PAGE_SIZE
+from restaurant_menu_app.schemas.scheme import (
+    DishBulkInfo,
+    DishCreate,
+    DishInfo,
+    DishUpdate,
+    Message,
+)
 from restaurant_menu_app.services.dishes import DishService, get_dish_service
+from restaurant_menu_app.services.pagination import unpack_page
+from restaurant_menu_app.services.responses import json_response
 
 router = APIRouter(
     prefix="/api/v1/menus/{menu_id}/submenus/{submenu_id}/dishes",
@@ -20,9 +29,15 @@ router = APIRouter(
 async def get_dishes(
     menu_id: str,
     submenu_id: str,
+    limit: int | None = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
     dish_service: DishService = Depends(get_dish_service),
-) -> list[DishInfo]:
-    return await dish_service.get_list(menu_id, submenu_id)
+) -> Response:
+    if limit is None and cursor is None:
+        return json_response(await dish_service.get_list(menu_id, submenu_id))
+
+    body, headers = unpack_page(await dish_service.get_page(menu_id, submenu_id, limit or PAGE_SIZE, cursor))
+    return json_response(body, headers)
 
 
 @router.get(
@@ -36,8 +51,8 @@ async def get_dish(
     submenu_id: str,
     dish_id: str,
     dish_service: DishService = Depends(get_dish_service),
-) -> DishInfo:
-    return await dish_service.get_info(menu_id, submenu_id, dish_id)
+) -> Response:
+    return json_response(await dish_service.get_info(menu_id, submenu_id, dish_id))
 
 
 @router.post(
@@ -55,6 +70,21 @@ async def post_dish(
     return await dish_service.create(menu_id, submenu_id, new_dish)
 
 
+@router.post(
+    path=":bulk",
+    response_model=DishBulkInfo,
+    summary="Пакетное создание блюд",
+    status_code=HTTPStatus.CREATED,
+)
+async def post_dishes_bulk(
+    menu_id: str,
+    submenu_id: str,
+    new_dishes: list[DishCreate] = Body(..., min_items=1, max_items=MAX_BULK_SIZE),
+    dish_service: DishService = Depends(get_dish_service),
+) -> DishBulkInfo:
+    return await dish_service.bulk_create(menu_id, submenu_id, new_dishes)
+
+
 @router.patch(
     path="/{dish_id}",
     response_model=DishInfo,
@@ -1,10 +1,12 @@
 from http import HTTPStatus
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import FileResponse
 
+from config import SEED_MAX_DISHES
 from restaurant_menu_app.schemas.scheme import Message
 from restaurant_menu_app.services.helper import HelperServise, get_helper_service
+from restaurant_menu_app.tasks.writers import ExportFormat
 
 router = APIRouter(
     prefix="/api/v1",
@@ -19,25 +21,53 @@ router = APIRouter(
     status_code=HTTPStatus.CREATED,
 )
 async def generate_data(
+    menus: int = Query(default=0, ge=0, description="Сгенерировать столько меню вместо готовых данных"),
+    submenus: int = Query(default=1, ge=0),
+    dishes: int = Query(default=1, ge=0),
     helper_service: HelperServise = Depends(get_helper_service),
 ) -> Message:
-    return await helper_service.generate_test_data()
+    # Каждый уровень ограничен отдельно: при dishes=0 произведение равно нулю, а меню и подменю всё равно создаются.
+    if max(menus, menus * submenus, menus * submenus * dishes) > SEED_MAX_DISHES:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail=f"Generated data must not exceed {SEED_MAX_DISHES} rows per table",
+        )
+    return await helper_service.generate_test_data(menus, submenus, dishes)
 
 
 @router.post(
     path="/content_as_file",
-    summary="Создание задачи на получение всех данных в excel-файле",
+    summary="Создание задачи на получение всех данных в файле",
     status_code=HTTPStatus.ACCEPTED,
 )
-async def create_file_with_full_content(helper_service: HelperServise = Depends(get_helper_service)):
-    return await helper_service.put_all_data_to_file()
+async def create_file_with_full_content(
+    format: ExportFormat = Query(
+        default=ExportFormat.xlsx,
+        description="xlsx повторяет дерево меню, остальные форматы отдают плоскую таблицу",
+    ),
+    helper_service: HelperServise = Depends(get_helper_service),
+):
+    return await helper_service.put_all_data_to_file(format)
+
+
+@router.get(
+    path="/content_as_file/stream",
+    summary="Получение всех данных в файле прямо в ответе",
+    status_code=HTTPStatus.OK,
+    responses={HTTPStatus.ACCEPTED.value: {"model": Message, "description": "Каталог большой, создана задача"}},
+)
+async def stream_file_with_full_content(
+    format: ExportFormat = Query(default=ExportFormat.csv, description="xlsx и parquet всегда выгружаются задачей"),
+    helper_service: HelperServise = Depends(get_helper_service),
+):
+    return await helper_service.stream_data(format)
 
 
 @router.get(
     path="/content_as_file/{task_id}",
-    summary="Получение результата задачи на получение всех данных в excel-файле",
+    summary="Получение результата задачи на получение всех данных в файле",
     status_code=HTTPStatus.OK,
     response_class=FileResponse,
 )
 async def get_file_with_full_content(task_id: str, helper_service: HelperServise = Depends(get_helper_service)):
-    return helper_service.get_all_data_in_file(task_id)
+    return await helper_service.get_all_data_in_file(task_id)
@@ -1,9 +1,18 @@
 from http import HTTPStatus
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Response
 
-from restaurant_menu_app.schemas.scheme import MenuCreate, MenuInfo, MenuUpdate, Message
+from config import MAX_PAGE_SIZE, PAGE_SIZE
+from restaurant_menu_app.schemas.scheme import (
+    MenuCreate,
+    MenuInfo,
+    MenuTree,
+    MenuUpdate,
+    Message,
+)
 from restaurant_menu_app.services.menus import MenuService, get_menu_service
+from restaurant_menu_app.services.pagination import unpack_page
+from restaurant_menu_app.services.responses import json_response
 
 router = APIRouter(
     prefix="/api/v1/menus",
@@ -18,9 +27,40 @@ router = APIRouter(
     status_code=HTTPStatus.OK,
 )
 async def get_menus(
+    limit: int | None = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    menu_service: MenuService = Depends(get_menu_service),
+) -> Response:
+    if limit is None and cursor is None:
+        return json_response(await menu_service.get_list())
+
+    body, headers = unpack_page(await menu_service.get_page(limit or PAGE_SIZE, cursor))
+    return json_response(body, headers)
+
+
+@router.get(
+    path="/tree",
+    response_model=list[MenuTree],
+    summary="Получение всех меню с подменю и блюдами",
+    status_code=HTTPStatus.OK,
+)
+async def get_menus_tree(
     menu_service: MenuService = Depends(get_menu_service),
-) -> list[MenuInfo]:
-    return await menu_service.get_list()
+) -> Response:
+    return json_response(await menu_service.get_tree())
+
+
+@router.get(
+    path="/{menu_id}/tree",
+    response_model=MenuTree,
+    summary="Получение меню с подменю и блюдами",
+    status_code=HTTPStatus.OK,
+)
+async def get_menu_tree(
+    menu_id: str,
+    menu_service: MenuService = Depends(get_menu_service),
+) -> Response:
+    return json_response(await menu_service.get_tree(menu_id))
 
 
 @router.get(
@@ -32,8 +72,8 @@ async def get_menus(
 async def get_menu(
     menu_id: str,
     menu_service: MenuService = Depends(get_menu_service),
-) -> MenuInfo:
-    return await menu_service.get_info(menu_id)
+) -> Response:
+    return json_response(await menu_service.get_info(menu_id))
 
 
 @router.post(
@@ -0,0 +1,23 @@
+from http import HTTPStatus
+
+from fastapi import APIRouter
+
+from restaurant_menu_app.db.cache.cache_settings import USE_LOCAL_CACHE, local_cache
+from restaurant_menu_app.services.metrics import metrics
+
+router = APIRouter(
+    prefix="/api/v1/metrics",
+    tags=["Metrics"],
+)
+
+
+@router.get(
+    path="",
+    summary="Метрики процесса приложения",
+    status_code=HTTPStatus.OK,
+)
+async def get_metrics() -> dict:
+    result = metrics.snapshot()
+    if USE_LOCAL_CACHE:
+        result["local_cache"] = local_cache.stats()
+    return result
@@ -1,13 +1,17 @@
 from http import HTTPStatus
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Body, Depends, Query, Response
 
+from config import MAX_BULK_SIZE, MAX_PAGE_SIZE, PAGE_SIZE
 from restaurant_menu_app.schemas.scheme import (
     Message,
+    SubmenuBulkInfo,
     SubmenuCreate,
     SubmenuInfo,
     SubmenuUpdate,
 )
+from restaurant_menu_app.services.pagination import unpack_page
+from restaurant_menu_app.services.responses import json_response
 from restaurant_menu_app.services.submenus import SubmenuService, get_submenu_service
 
 router = APIRouter(
@@ -24,9 +28,15 @@ router = APIRouter(
 )
 async def get_submenus(
     menu_id: str,
+    limit: int | None = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
     submenu_service: SubmenuService = Depends(get_submenu_service),
-) -> list[SubmenuInfo]:
-    return await submenu_service.get_list(menu_id)
+) -> Response:
+    if limit is None and cursor is None:
+        return json_response(await submenu_service.get_list(menu_id))
+
+    body, headers = unpack_page(await submenu_service.get_page(menu_id, limit or PAGE_SIZE, cursor))
+    return json_response(body, headers)
 
 
 @router.get(
@@ -39,8 +49,8 @@ async def get_submenu(
     menu_id: str,
     submenu_id: str,
     submenu_service: SubmenuService = Depends(get_submenu_service),
-) -> SubmenuInfo:
-    return await submenu_service.get_info(menu_id, submenu_id)
+) -> Response:
+    return json_response(await submenu_service.get_info(menu_id, submenu_id))
 
 
 @router.post(
@@ -57,6 +67,20 @@ async def post_submenu(
     return await submenu_service.create(menu_id, new_submenu)
 
 
+@router.post(
+    path=":bulk",
+    response_model=SubmenuBulkInfo,
+    summary="Пакетное создание подменю",
+    status_code=HTTPStatus.CREATED,
+)
+async def post_submenus_bulk(
+    menu_id: str,
+    new_submenus: list[SubmenuCreate] = Body(..., min_items=1, max_items=MAX_BULK_SIZE),
+    submenu_service: SubmenuService = Depends(get_submenu_service),
+) -> SubmenuBulkInfo:
+    return await submenu_service.bulk_create(menu_id, new_submenus)
+
+
 @router.patch(
     path="/{submenu_id}",
     response_model=SubmenuInfo,
@@ -1,4 +1,6 @@
 from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+from typing import Any
 
 
 class AbstractCache(ABC):
@@ -11,13 +13,58 @@ class AbstractCache(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    async def set(self, key: str, value: str, expire_time: int = 5):
+    async def get_or_none(self, key: str):
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        expire_time: int = 5,
+        tags: Iterable[str] = (),
+        stale_time: int = 0,
+        refresher: Callable[[], Awaitable[Any]] | None = None,
+    ):
+        raise NotImplementedError
+
+    @abstractmethod
+    async def set(
+        self,
+        key: str,
+        value: str | bytes,
+        expire_time: int = 5,
+        tags: Iterable[str] = (),
+        stale_time: int = 0,
+    ):
+        raise NotImplementedError
+
+    @abstractmethod
+    async def set_many(
+        self,
+        mapping: Mapping[str, Any],
+        expire_time: int = 5,
+        tags: Iterable[str] = (),
+        stale_time: int = 0,
+    ):
         raise NotImplementedError
 
     @abstractmethod
     async def clear(self, key: str):
         raise NotImplementedError
 
+    @abstractmethod
+    async def clear_many(self, *keys: str):
+        raise NotImplementedError
+
+    @abstractmethod
+    async def invalidate_tags(self, *tags: str, keys: Iterable[str] = ()):
+        raise NotImplementedError
+
+    @abstractmethod
+    async def flush(self):
+        raise NotImplementedError
+
     @abstractmethod
     async def is_cached(self, key: str):
         raise NotImplementedError
@@ -0,0 +1,53 @@
+"""Ключи кэша, привязанные к иерархии меню -> подменю -> блюдо, и теги для каскадной инвалидации."""
+
+MENUS = "menus"
+TREE = "menus:tree"
+TREE_TAG = "tree"
+
+
+def menu(menu_id) -> str:
+    return f"menu:{menu_id}"
+
+
+def submenus(menu_id) -> str:
+    return f"menu:{menu_id}:submenus"
+
+
+def submenu(menu_id, submenu_id) -> str:
+    return f"menu:{menu_id}:submenu:{submenu_id}"
+
+
+def dishes(menu_id, submenu_id) -> str:
+    return f"menu:{menu_id}:submenu:{submenu_id}:dishes"
+
+
+def dish(menu_id, submenu_id, dish_id) -> str:
+    return f"menu:{menu_id}:submenu:{submenu_id}:dish:{dish_id}"
+
+
+def menu_tree(menu_id) -> str:
+    return f"menu:{menu_id}:tree"
+
+
+def page(list_key: str, limit: int, cursor: str | None) -> str:
+    return f"{list_key}:page:{limit}:{cursor or ''}"
+
+
+def export(export_format: str, revision: int) -> str:
+    return f"export:{export_format}:{revision}"
+
+
+def export_file(task_id: str) -> str:
+    return f"export:task:{task_id}"
+
+
+def menu_tag(menu_id) -> str:
+    return f"menu:{menu_id}"
+
+
+def submenu_tag(submenu_id) -> str:
+    return f"submenu:{submenu_id}"
+
+
+def pages_tag(list_key: str) -> str:
+    return f"pages:{list_key}"
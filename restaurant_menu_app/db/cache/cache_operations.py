@@ -1,31 +1,640 @@
-import json
+import asyncio
+import logging
+import math
+import random
+import time
+from collections.abc import Awaitable, Callable, Coroutine, Iterable, Mapping
+from functools import partial
+from typing import Any
 
 from aioredis.client import Redis
-from fastapi.encoders import jsonable_encoder
+from aioredis.exceptions import LockError, RedisError
 
 from restaurant_menu_app.db.cache.abstract_cache import AbstractCache
+from restaurant_menu_app.db.cache.circuit_breaker import CircuitBreaker
+from restaurant_menu_app.db.cache.local_cache import LocalCache
+from restaurant_menu_app.db.cache.serializers import AbstractSerializer
 
-from .cache_settings import EXPIRE_TIME, redis_client
+from .cache_settings import (
+    DELTA_PREFIX,
+    EARLY_REFRESH_BETA,
+    EXPIRE_TIME,
+    FLUSH_MESSAGE,
+    INSTANCE_ID,
+    INVALIDATION_CHANNEL,
+    LOCK_POLL_INTERVAL,
+    LOCK_PREFIX,
+    LOCK_TIMEOUT,
+    TAG_PREFIX,
+    USE_LOCAL_CACHE,
+    circuit_breaker,
+    local_cache,
+    redis_client,
+    response_serializer,
+    serializer,
+)
+
+logger = logging.getLogger(__name__)
+
+_in_flight: dict[str, asyncio.Future] = {}
+_background_tasks: set[asyncio.Task] = set()
+
+
+def _consume_exception(future: asyncio.Future):
+    if not future.cancelled():
+        future.exception()
+
+
+async def single_flight(key: str, load: Callable[[], Awaitable[Any]]):
+    """Выполнить load один раз на ключ: конкурентные вызовы в процессе ждут результата первого."""
+
+    future = _in_flight.get(key)
+    if future is not None:
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            if not future.cancelled():
+                raise
+            return await load()
+
+    future = asyncio.get_running_loop().create_future()
+    future.add_done_callback(_consume_exception)
+    _in_flight[key] = future
+    try:
+        value = await load()
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        raise
+    else:
+        future.set_result(value)
+        return value
+    finally:
+        del _in_flight[key]
+
+
+def _finish_background_task(task: asyncio.Task):
+    _background_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Background cache refresh failed", exc_info=task.exception())
+
+
+def should_refresh_early(ttl: float | None, delta: float | None, beta: float = EARLY_REFRESH_BETA) -> bool:
+    """Вероятностное досрочное обновление (XFetch): чем ближе истечение ключа, тем выше шанс."""
+
+    if not beta or ttl is None or delta is None or ttl <= 0:
+        return False
+    return delta * beta * -math.log(1.0 - random.random()) >= ttl
 
 
 class Cache(AbstractCache):
-    def __init__(self, cache_client: Redis) -> None:
+    def __init__(self, cache_client: Redis, serializer: AbstractSerializer = serializer) -> None:
         self.redis_client = cache_client
+        self.serializer = serializer
 
     async def get(self, key: str):
         value = await self.redis_client.get(key)
-        return json.loads(value)
+        return self.serializer.loads(value)
+
+    async def get_or_none(self, key: str):
+        """Получить значение из кэша за один запрос к Redis или None, если ключа нет."""
+
+        value = await self.redis_client.get(key)
+        if value is None:
+            return None
+        return self.serializer.loads(value)
+
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        expire_time=EXPIRE_TIME,
+        tags: Iterable[str] = (),
+        stale_time: int = 0,
+        refresher: Callable[[], Awaitable[Any]] | None = None,
+    ):
+        """Получить значение из кэша, а при промахе загрузить его через loader и закэшировать.
+
+        Загрузка одного ключа выполняется одним запросом на процесс и одним процессом на кэш.
+        Если задан stale_time, значение ещё stale_time секунд после истечения отдаётся сразу,
+        а refresher, не зависящий от сессии запроса, обновляет его в фоне.
+        """
+
+        if EARLY_REFRESH_BETA or stale_time:
+            value, ttl, delta = await self.get_with_ttl(key)
+            fresh_ttl = ttl - stale_time if ttl is not None else None
+            is_stale = fresh_ttl is not None and fresh_ttl <= 0
+            if value is not None and is_stale and refresher is not None:
+                self.revalidate(key, refresher, expire_time, tags, stale_time, value)
+                return value
+            if value is not None and not is_stale and not should_refresh_early(fresh_ttl, delta):
+                return value
+        else:
+            value = await self.get_or_none(key)
+            if value is not None:
+                return value
+
+        return await single_flight(key, partial(self.load, key, loader, expire_time, tags, stale_time, value))
+
+    def revalidate(
+        self,
+        key: str,
+        refresher: Callable[[], Awaitable[Any]],
+        expire_time: int,
+        tags: Iterable[str],
+        stale_time: int,
+        stale: Any,
+    ):
+        """Запустить фоновое обновление устаревшего значения, если оно ещё не выполняется."""
+
+        if key in _in_flight:
+            return
+        task = asyncio.create_task(
+            single_flight(key, partial(self.load, key, refresher, expire_time, tags, stale_time, stale)),
+        )
+        _background_tasks.add(task)
+        task.add_done_callback(_finish_background_task)
+
+    async def get_with_ttl(self, key: str):
+        """Получить значение, оставшееся время жизни ключа и длительность его последней загрузки."""
+
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            pipe.get(key)
+            pipe.pttl(key)
+            pipe.get(DELTA_PREFIX + key)
+            value, ttl, delta = await pipe.execute()
+
+        if value is None:
+            return None, None, None
+        return (
+            self.serializer.loads(value),
+            ttl / 1000 if ttl > 0 else None,
+            float(delta) if delta is not None else None,
+        )
+
+    async def load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        expire_time: int,
+        tags: Iterable[str],
+        stale_time: int = 0,
+        stale: Any = None,
+    ):
+        """Загрузить значение под блокировкой в Redis, чтобы loader выполнял только один процесс."""
+
+        lock = self.redis_client.lock(LOCK_PREFIX + key, timeout=LOCK_TIMEOUT)
+        if not await lock.acquire(blocking=False):
+            if stale is not None:
+                return stale
+            value = await self.wait_for_value(key)
+            if value is not None:
+                return value
+            return await self.load_and_set(key, loader, expire_time, tags, stale_time)
+
+        try:
+            return await self.load_and_set(key, loader, expire_time, tags, stale_time)
+        finally:
+            try:
+                await lock.release()
+            except LockError:
+                pass
+
+    async def wait_for_value(self, key: str):
+        """Дождаться значения, которое загружает другой процесс, пока тот держит блокировку."""
 
-    async def set(self, key: str, value: str, expire_time=EXPIRE_TIME):
-        value = json.dumps(jsonable_encoder(value))
-        await self.redis_client.set(key, value, expire_time)
+        deadline = time.monotonic() + LOCK_TIMEOUT
+        while time.monotonic() < deadline:
+            await asyncio.sleep(LOCK_POLL_INTERVAL)
+            value = await self.get_or_none(key)
+            if value is not None:
+                return value
+            if not await self.redis_client.exists(LOCK_PREFIX + key):
+                break
+        return None
+
+    async def load_and_set(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        expire_time: int,
+        tags: Iterable[str],
+        stale_time: int = 0,
+    ):
+        started = time.monotonic()
+        value = await loader()
+        if value is not None:
+            await self.set(key, value, expire_time, tags, stale_time)
+            if EARLY_REFRESH_BETA:
+                await self.redis_client.set(
+                    DELTA_PREFIX + key,
+                    time.monotonic() - started,
+                    expire_time + stale_time,
+                )
+        return value
+
+    async def set(
+        self,
+        key: str,
+        value: str | bytes,
+        expire_time=EXPIRE_TIME,
+        tags: Iterable[str] = (),
+        stale_time: int = 0,
+    ):
+        await self._write({key: self.serializer.dumps(value)}, expire_time + stale_time, tags)
+
+    async def set_many(
+        self,
+        mapping: Mapping[str, Any],
+        expire_time=EXPIRE_TIME,
+        tags: Iterable[str] = (),
+        stale_time: int = 0,
+    ):
+        """Записать несколько значений одним конвейером команд."""
+
+        encoded = {key: self.serializer.dumps(value) for key, value in mapping.items()}
+        await self._write(encoded, expire_time + stale_time, tags)
+
+    async def _write(self, encoded: Mapping[str, bytes], expire_time: int, tags: Iterable[str]):
+        if not encoded:
+            return
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            for key, value in encoded.items():
+                pipe.set(key, value, expire_time)
+            for tag in tags:
+                pipe.sadd(TAG_PREFIX + tag, *encoded)
+                # Тег живёт не меньше самого долгоживущего ключа: NX задаёт TTL новому множеству, GT только продлевает.
+                pipe.execute_command("EXPIRE", TAG_PREFIX + tag, expire_time, "NX")
+                pipe.execute_command("EXPIRE", TAG_PREFIX + tag, expire_time, "GT")
+            await pipe.execute()
 
     async def clear(self, key: str):
         await self.redis_client.delete(key)
 
+    async def clear_many(self, *keys: str):
+        """Удалить несколько ключей одной командой DEL."""
+
+        if keys:
+            await self.redis_client.delete(*keys)
+
+    async def invalidate_tags(self, *tags: str, keys: Iterable[str] = ()):
+        """Удалить все ключи, закэшированные с любым из тегов, вместе с ключами из keys."""
+
+        tag_keys = [TAG_PREFIX + tag for tag in tags]
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            for tag_key in tag_keys:
+                pipe.smembers(tag_key)
+            members = await pipe.execute()
+
+        tagged_keys = {key.decode() for tag_members in members for key in tag_members}
+        await self.clear_many(*tagged_keys.union(keys), *tag_keys)
+
     async def is_cached(self, key: str):
         return await self.redis_client.exists(key)
 
+    async def flush(self):
+        await self.redis_client.flushdb()
+
+
+class TwoTierCache(Cache):
+    """Кэш в памяти процесса (L1) перед общим кэшем в Redis (L2).
+
+    Изменения ключей рассылаются остальным процессам через Redis pub/sub,
+    чтобы они удалили устаревшие записи из своего L1.
+    """
+
+    def __init__(
+        self,
+        cache_client: Redis,
+        local_cache: LocalCache,
+        serializer: AbstractSerializer = serializer,
+    ) -> None:
+        super().__init__(cache_client, serializer)
+        self.local_cache = local_cache
+
+    async def get(self, key: str):
+        value = await self.get_or_none(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    async def get_or_none(self, key: str):
+        value = self.local_cache.get(key)
+        if value is not None:
+            return value
+
+        value = await super().get_or_none(key)
+        if value is not None:
+            self.local_cache.set(key, value)
+        return value
+
+    async def get_with_ttl(self, key: str):
+        value = self.local_cache.get(key)
+        if value is not None:
+            return value, None, None
+
+        value, ttl, delta = await super().get_with_ttl(key)
+        if value is not None:
+            self.local_cache.set(key, value)
+        return value, ttl, delta
+
+    async def set(
+        self,
+        key: str,
+        value: str | bytes,
+        expire_time=EXPIRE_TIME,
+        tags: Iterable[str] = (),
+        stale_time: int = 0,
+    ):
+        await self.set_many({key: value}, expire_time, tags, stale_time)
+
+    async def set_many(
+        self,
+        mapping: Mapping[str, Any],
+        expire_time=EXPIRE_TIME,
+        tags: Iterable[str] = (),
+        stale_time: int = 0,
+    ):
+        encoded = {key: self.serializer.dumps(value) for key, value in mapping.items()}
+        await self._write(encoded, expire_time + stale_time, tags)
+        for key, value in encoded.items():
+            self.local_cache.set(key, self.serializer.loads(value), expire_time)
+        await self.publish_invalidation(*encoded)
+
+    async def clear(self, key: str):
+        self.local_cache.delete(key)
+        await super().clear(key)
+        await self.publish_invalidation(key)
+
+    async def clear_many(self, *keys: str):
+        for key in keys:
+            self.local_cache.delete(key)
+        await super().clear_many(*keys)
+        await self.publish_invalidation(*keys)
+
+    async def is_cached(self, key: str):
+        if self.local_cache.get(key) is not None:
+            return True
+        return await super().is_cached(key)
+
+    async def flush(self):
+        self.local_cache.clear()
+        await super().flush()
+        await self.publish_invalidation(FLUSH_MESSAGE)
+
+    async def publish_invalidation(self, *keys: str):
+        if keys:
+            await self.redis_client.publish(INVALIDATION_CHANNEL, f"{INSTANCE_ID}:" + "\n".join(keys))
+
+
+CACHE_ERRORS = (RedisError, OSError, asyncio.TimeoutError)
+
+
+class FallbackCache(AbstractCache):
+    """Обёртка над кэшем, которая при недоступности Redis работает напрямую с базой данных.
+
+    Ошибки кэша размыкают circuit breaker, и пока он разомкнут, Redis не опрашивается.
+    Если во время сбоя не удалось удалить ключи, после восстановления кэш очищается целиком.
+    """
+
+    def __init__(self, cache_client: AbstractCache, breaker: CircuitBreaker) -> None:
+        self.cache = cache_client
+        self.breaker = breaker
+
+    async def get(self, key: str):
+        return await self.guard(self.cache.get(key))
+
+    async def get_or_none(self, key: str):
+        return await self.guard(self.cache.get_or_none(key))
+
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        expire_time=EXPIRE_TIME,
+        tags: Iterable[str] = (),
+        stale_time: int = 0,
+        refresher: Callable[[], Awaitable[Any]] | None = None,
+    ):
+        if not self.breaker.allow_request():
+            return await loader()
+
+        loader_failed = False
+
+        async def tracked_loader():
+            nonlocal loader_failed
+            try:
+                return await loader()
+            except Exception:
+                loader_failed = True
+                raise
+
+        try:
+            value = await self.cache.get_or_load(key, tracked_loader, expire_time, tags, stale_time, refresher)
+        except CACHE_ERRORS as e:
+            if loader_failed:
+                raise
+            await self.on_failure(e)
+            return await loader()
+        await self.on_success()
+        return value
+
+    async def set(
+        self,
+        key: str,
+        value: str | bytes,
+        expire_time=EXPIRE_TIME,
+        tags: Iterable[str] = (),
+        stale_time: int = 0,
+    ):
+        await self.guard(self.cache.set(key, value, expire_time, tags, stale_time))
+
+    async def set_many(
+        self,
+        mapping: Mapping[str, Any],
+        expire_time=EXPIRE_TIME,
+        tags: Iterable[str] = (),
+        stale_time: int = 0,
+    ):
+        await self.guard(self.cache.set_many(mapping, expire_time, tags, stale_time))
+
+    async def clear(self, key: str):
+        await self.guard(self.cache.clear(key), invalidation=True)
+
+    async def clear_many(self, *keys: str):
+        await self.guard(self.cache.clear_many(*keys), invalidation=True)
+
+    async def invalidate_tags(self, *tags: str, keys: Iterable[str] = ()):
+        await self.guard(self.cache.invalidate_tags(*tags, keys=keys), invalidation=True)
+
+    async def flush(self):
+        await self.guard(self.cache.flush(), invalidation=True)
+
+    async def is_cached(self, key: str):
+        return bool(await self.guard(self.cache.is_cached(key)))
+
+    async def guard(self, operation: Coroutine[Any, Any, Any], invalidation: bool = False):
+        """Выполнить операцию с кэшем; при ошибке или разомкнутом breaker вернуть None."""
+
+        if not self.breaker.allow_request():
+            operation.close()
+            self.breaker.missed_invalidations |= invalidation
+            return None
+        try:
+            result = await operation
+        except CACHE_ERRORS as e:
+            self.breaker.missed_invalidations |= invalidation
+            await self.on_failure(e)
+            return None
+        await self.on_success()
+        return result
+
+    async def on_failure(self, error: BaseException):
+        logger.warning("Cache is unavailable, falling back to the database: %r", error)
+        self.breaker.record_failure()
+
+    async def on_success(self):
+        self.breaker.record_success()
+        if self.breaker.missed_invalidations:
+            self.breaker.missed_invalidations = False
+            try:
+                await self.cache.flush()
+            except CACHE_ERRORS as e:
+                self.breaker.missed_invalidations = True
+                await self.on_failure(e)
+
+
+class ReplicaCache(AbstractCache):
+    """Кэш для запросов, которые читают из реплики.
+
+    Реплика может отставать, поэтому промах заполняется через refresher, который читает основную базу
+    в собственной сессии, с той же загрузкой одним запросом на ключ, что и без реплики.
+    Значение, прочитанное из реплики, в кэш не пишется.
+    """
+
+    def __init__(self, cache_client: AbstractCache) -> None:
+        self.cache = cache_client
+
+    async def get(self, key: str):
+        return await self.cache.get(key)
+
+    async def get_or_none(self, key: str):
+        return await self.cache.get_or_none(key)
+
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        expire_time=EXPIRE_TIME,
+        tags: Iterable[str] = (),
+        stale_time: int = 0,
+        refresher: Callable[[], Awaitable[Any]] | None = None,
+    ):
+        if refresher is not None:
+            return await self.cache.get_or_load(key, refresher, expire_time, tags, stale_time, refresher)
+        value = await self.cache.get_or_none(key)
+        if value is not None:
+            return value
+        return await loader()
+
+    async def set(
+        self,
+        key: str,
+        value: str | bytes,
+        expire_time=EXPIRE_TIME,
+        tags: Iterable[str] = (),
+        stale_time: int = 0,
+    ):
+        await self.cache.set(key, value, expire_time, tags, stale_time)
+
+    async def set_many(
+        self,
+        mapping: Mapping[str, Any],
+        expire_time=EXPIRE_TIME,
+        tags: Iterable[str] = (),
+        stale_time: int = 0,
+    ):
+        await self.cache.set_many(mapping, expire_time, tags, stale_time)
+
+    async def clear(self, key: str):
+        await self.cache.clear(key)
+
+    async def clear_many(self, *keys: str):
+        await self.cache.clear_many(*keys)
+
+    async def invalidate_tags(self, *tags: str, keys: Iterable[str] = ()):
+        await self.cache.invalidate_tags(*tags, keys=keys)
+
+    async def flush(self):
+        await self.cache.flush()
+
+    async def is_cached(self, key: str):
+        return await self.cache.is_cached(key)
+
+
+async def listen_invalidations(cache_client: Redis, local_cache: LocalCache):
+    """Удалять из L1 ключи, изменённые другими процессами, и очищать его целиком после их flush."""
+
+    while True:
+        pubsub = cache_client.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(INVALIDATION_CHANNEL)
+            while True:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                if message is None:
+                    continue
+                sender, _, keys = message["data"].decode().partition(":")
+                if sender == INSTANCE_ID:
+                    continue
+                if keys == FLUSH_MESSAGE:
+                    local_cache.clear()
+                    continue
+                for key in keys.split("\n"):
+                    local_cache.delete(key)
+        except CACHE_ERRORS:
+            logger.warning("Cache invalidation channel is unavailable, dropping local cache")
+            local_cache.clear()
+            await asyncio.sleep(1)
+        finally:
+            await pubsub.close()
+
+
+_invalidation_listener: asyncio.Task | None = None
+
+
+def start_invalidation_listener():
+    global _invalidation_listener
+    if USE_LOCAL_CACHE and _invalidation_listener is None:
+        _invalidation_listener = asyncio.create_task(listen_invalidations(redis_client, local_cache))
+
+
+async def stop_invalidation_listener():
+    global _invalidation_listener
+    if _invalidation_listener is not None:
+        _invalidation_listener.cancel()
+        try:
+            await _invalidation_listener
+        except asyncio.CancelledError:
+            pass
+        _invalidation_listener = None
+
+
+def build_cache(value_serializer: AbstractSerializer) -> AbstractCache:
+    cache: AbstractCache
+    if USE_LOCAL_CACHE:
+        cache = TwoTierCache(cache_client=redis_client, local_cache=local_cache, serializer=value_serializer)
+    else:
+        cache = Cache(cache_client=redis_client, serializer=value_serializer)
+    return FallbackCache(cache_client=cache, breaker=circuit_breaker)
+
 
 def get_cache():
-    return Cache(cache_client=redis_client)
+    return build_cache(serializer)
+
+
+def get_response_cache():
+    """Кэш готовых тел ответов: значения пишутся и отдаются байтами без повторной сериализации."""
+
+    return build_cache(response_serializer)
@@ -1,10 +1,69 @@
+import uuid
+
 import aioredis
 
-from config import REDIS_DB, REDIS_EXP, REDIS_HOST
+from config import (
+    CACHE_EARLY_REFRESH_BETA,
+    CACHE_FAILURE_THRESHOLD,
+    CACHE_LOCK_TIMEOUT,
+    CACHE_RESET_TIMEOUT,
+    CACHE_SERIALIZER,
+    CACHE_STALE_TIME,
+    CACHE_WARM_UP,
+    LOCAL_CACHE_ENABLED,
+    LOCAL_CACHE_EXP,
+    LOCAL_CACHE_MAX_SIZE,
+    REDIS_CONNECT_TIMEOUT,
+    REDIS_DB,
+    REDIS_EXP,
+    REDIS_HEALTH_CHECK_INTERVAL,
+    REDIS_HOST,
+    REDIS_MAX_CONNECTIONS,
+    REDIS_POOL_TIMEOUT,
+    REDIS_PORT,
+    REDIS_SOCKET_TIMEOUT,
+)
+from restaurant_menu_app.db.cache.circuit_breaker import CircuitBreaker
+from restaurant_menu_app.db.cache.local_cache import LocalCache
+from restaurant_menu_app.db.cache.serializers import RawSerializer, get_serializer
 
-redis_client = aioredis.from_url(
-    f"redis://{REDIS_HOST}",
+redis_pool = aioredis.BlockingConnectionPool.from_url(
+    f"redis://{REDIS_HOST}:{REDIS_PORT}",
     db=REDIS_DB,
+    max_connections=REDIS_MAX_CONNECTIONS,
+    timeout=REDIS_POOL_TIMEOUT,
+    socket_timeout=REDIS_SOCKET_TIMEOUT,
+    socket_connect_timeout=REDIS_CONNECT_TIMEOUT,
+    retry_on_timeout=True,
+    health_check_interval=REDIS_HEALTH_CHECK_INTERVAL,
+)
+redis_client = aioredis.Redis(connection_pool=redis_pool)
+
+circuit_breaker = CircuitBreaker(
+    failure_threshold=CACHE_FAILURE_THRESHOLD,
+    reset_timeout=CACHE_RESET_TIMEOUT,
 )
 
 EXPIRE_TIME = REDIS_EXP
+STALE_TIME = CACHE_STALE_TIME
+WARM_UP_ON_STARTUP = CACHE_WARM_UP
+TAG_PREFIX = "tag:"
+
+LOCK_PREFIX = "lock:"
+LOCK_TIMEOUT = CACHE_LOCK_TIMEOUT
+LOCK_POLL_INTERVAL = 0.05
+
+DELTA_PREFIX = "delta:"
+EARLY_REFRESH_BETA = CACHE_EARLY_REFRESH_BETA
+
+# Тела ответов кэшируются готовыми байтами, поэтому CACHE_SERIALIZER влияет только на служебные ключи, например на id
+# задач выгрузки.
+serializer = get_serializer(CACHE_SERIALIZER)
+response_serializer = RawSerializer()
+
+USE_LOCAL_CACHE = LOCAL_CACHE_ENABLED
+INVALIDATION_CHANNEL = "cache_invalidation"
+FLUSH_MESSAGE = "*"
+INSTANCE_ID = uuid.uuid4().hex
+
+local_cache = LocalCache(max_size=LOCAL_CACHE_MAX_SIZE, ttl=LOCAL_CACHE_EXP)
@@ -0,0 +1,90 @@
+import json
+from abc import ABC, abstractmethod
+from typing import Any
+from uuid import UUID
+
+from fastapi.encoders import jsonable_encoder
+
+
+def encode_default(obj: Any):
+    """Преобразовать в базовые типы то, что сериализатор не умеет кодировать сам."""
+
+    if hasattr(obj, "_asdict"):
+        return obj._asdict()
+    if isinstance(obj, UUID):
+        return str(obj)
+    return jsonable_encoder(obj)
+
+
+class AbstractSerializer(ABC):
+    @abstractmethod
+    def dumps(self, value: Any) -> bytes:
+        raise NotImplementedError
+
+    @abstractmethod
+    def loads(self, data: bytes) -> Any:
+        raise NotImplementedError
+
+
+class JSONSerializer(AbstractSerializer):
+    def dumps(self, value: Any) -> bytes:
+        return json.dumps(jsonable_encoder(value)).encode()
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class ORJSONSerializer(AbstractSerializer):
+    def __init__(self) -> None:
+        import orjson  # type: ignore
+
+        self.orjson = orjson
+
+    def dumps(self, value: Any) -> bytes:
+        return self.orjson.dumps(value, default=encode_default)
+
+    def loads(self, data: bytes) -> Any:
+        return self.orjson.loads(data)
+
+
+class MsgpackSerializer(AbstractSerializer):
+    def __init__(self) -> None:
+        import msgpack  # type: ignore
+
+        self.msgpack = msgpack
+
+    def dumps(self, value: Any) -> bytes:
+        return self.msgpack.packb(value, default=encode_default)
+
+    def loads(self, data: bytes) -> Any:
+        return self.msgpack.unpackb(data, raw=False)
+
+
+class RawSerializer(AbstractSerializer):
+    """Хранит уже закодированные значения, например готовые тела ответов, без преобразований."""
+
+    def dumps(self, value: bytes) -> bytes:
+        return value
+
+    def loads(self, data: bytes) -> bytes:
+        return data
+
+
+SERIALIZERS: dict[str, type[AbstractSerializer]] = {
+    "json": JSONSerializer,
+    "orjson": ORJSONSerializer,
+    "msgpack": MsgpackSerializer,
+}
+
+
+def get_serializer(name: str) -> AbstractSerializer:
+    try:
+        serializer_class = SERIALIZERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown cache serializer: {name}")
+    try:
+        return serializer_class()
+    except ImportError:
+        raise ValueError(
+            f"CACHE_SERIALIZER={name} requires the {name} package: install it with `poetry install -E {name}`"
+        )
@@ -5,8 +5,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 class AbstractCRUD(ABC):
     @abstractmethod
-    def __init__(self, db: AsyncSession) -> None:
+    def __init__(self, db: AsyncSession, read_db: AsyncSession | None = None) -> None:
         self.db = db
+        self.read_db = read_db or db
 
     @abstractmethod
     async def read_all(self, *args, **kwargs):
@@ -16,10 +17,20 @@ class AbstractCRUD(ABC):
     async def read(self, *args, **kwargs):
         raise NotImplementedError
 
+    async def read_tree(self, *args, **kwargs):
+        """Дерево с вложенными уровнями есть только у меню."""
+
+        raise NotImplementedError
+
     @abstractmethod
     async def create(self, *args, **kwargs):
         raise NotImplementedError
 
+    async def bulk_create(self, *args, **kwargs):
+        """Пакетная вставка есть только у подменю и блюд."""
+
+        raise NotImplementedError
+
     @abstractmethod
     async def update(self, *args, **kwargs):
         raise NotImplementedError
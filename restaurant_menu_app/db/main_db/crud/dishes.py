@@ -1,4 +1,19 @@
-from sqlalchemy import delete, select, update
+import uuid
+
+from sqlalchemy import (
+    Float,
+    String,
+    column,
+    delete,
+    insert,
+    literal,
+    select,
+    true,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from restaurant_menu_app.db.main_db.crud.abstract_crud import AbstractCRUD
@@ -7,10 +22,11 @@ from restaurant_menu_app.schemas import scheme
 
 
 class DishCRUD(AbstractCRUD):
-    def __init__(self, db: AsyncSession) -> None:
+    def __init__(self, db: AsyncSession, read_db: AsyncSession | None = None) -> None:
         self.db = db
+        self.read_db = read_db or db
 
-    async def read_all(self, menu_id: str, submenu_id: str):
+    async def read_all(self, menu_id: str, submenu_id: str, limit: int | None = None, after: str | None = None):
         query = (
             select(
                 model.Dish.id,
@@ -26,7 +42,11 @@ class DishCRUD(AbstractCRUD):
                 model.Submenu.menu_id == menu_id,
             )
         )
-        result = await self.db.execute(query)
+        if after:
+            query = query.where(model.Dish.id > after)
+        if limit:
+            query = query.order_by(model.Dish.id).limit(limit)
+        result = await self.read_db.execute(query)
         return result.all()
 
     async def read(self, menu_id: str, submenu_id: str, dish_id: str):
@@ -42,16 +62,80 @@ class DishCRUD(AbstractCRUD):
             model.Dish.id == dish_id,
             model.Dish.submenu_id == submenu_id,
         )
-        result = await self.db.execute(query)
+        result = await self.read_db.execute(query)
         return result.first()
 
-    async def create(self, submenu_id: str, data: scheme.DishCreate):
-        new_dish = model.Dish(submenu_id=submenu_id, **data.dict())
-        self.db.add(new_dish)
+    async def create(self, menu_id: str, submenu_id: str, data: scheme.DishCreate):
+        """Создать блюдо, только если подменю принадлежит меню из адреса; иначе вернуть None."""
+
+        values = {"id": uuid.uuid4(), **data.dict()}
+        parent = select(
+            model.Submenu.id,
+            *(literal(value, model.Dish.__table__.c[name].type) for name, value in values.items()),
+        ).where(
+            model.Submenu.id == submenu_id,
+            model.Submenu.menu_id == menu_id,
+        )
+        stmt = (
+            insert(
+                model.Dish,
+            )
+            .from_select(["submenu_id", *values], parent)
+            .returning(
+                model.Dish.id,
+                model.Dish.title,
+                model.Dish.description,
+                model.Dish.price,
+            )
+        )
+        result = await self.db.execute(stmt)
+        new_dish = result.first()
         await self.db.commit()
-        await self.db.refresh(new_dish)
         return new_dish
 
+    async def bulk_create(self, menu_id: str, submenu_id: str, data: list[scheme.DishCreate]):
+        """Вставить пакет блюд, только если подменю принадлежит меню из адреса; иначе вернуть None."""
+
+        items = values(
+            column("id", UUID(as_uuid=True)),
+            column("title", String),
+            column("description", String),
+            column("price", Float),
+            name="items",
+        ).data([(uuid.uuid4(), item.title, item.description, item.price) for item in data])
+        parent_filter = (model.Submenu.id == submenu_id, model.Submenu.menu_id == menu_id)
+        parent = (
+            select(
+                items.c.id,
+                model.Submenu.id,
+                items.c.title,
+                items.c.description,
+                items.c.price,
+            )
+            .select_from(items.join(model.Submenu, true()))
+            .where(*parent_filter)
+        )
+        stmt = (
+            pg_insert(
+                model.Dish,
+            )
+            .from_select(["id", "submenu_id", "title", "description", "price"], parent)
+            .on_conflict_do_nothing(constraint="_submenu_dish_uc")
+            .returning(
+                model.Dish.id,
+                model.Dish.title,
+                model.Dish.description,
+                model.Dish.price,
+            )
+        )
+        result = await self.db.execute(stmt)
+        new_dishes = result.all()
+        # Пустой результат бывает и когда все названия уже заняты: тогда подменю на месте.
+        if not new_dishes and not await self.db.scalar(select(select(model.Submenu.id).where(*parent_filter).exists())):
+            new_dishes = None
+        await self.db.commit()
+        return new_dishes
+
     async def update(
         self,
         menu_id: str,
@@ -59,11 +143,10 @@ class DishCRUD(AbstractCRUD):
         dish_id: str,
         patch: scheme.DishUpdate,
     ):
-        dish_to_update = await self.read(menu_id, submenu_id, dish_id)
-        values = patch.dict(exclude_unset=True)
-        for key, value in values.items():
-            if not value:
-                values[key] = dish_to_update[key]
+        values = {key: value for key, value in patch.dict(exclude_unset=True).items() if value}
+        if not values:
+            return await self.read(menu_id, submenu_id, dish_id)
+
         stmt = (
             update(
                 model.Dish,
@@ -71,21 +154,42 @@ class DishCRUD(AbstractCRUD):
             .where(
                 model.Dish.id == dish_id,
                 model.Dish.submenu_id == submenu_id,
+                model.Submenu.id == model.Dish.submenu_id,
+                model.Submenu.menu_id == menu_id,
             )
             .values(**values)
+            .returning(
+                model.Dish.id,
+                model.Dish.title,
+                model.Dish.description,
+                model.Dish.price,
+            )
+            # Условие ссылается на подменю, а объекты блюд в сессии не загружаются: синхронизировать нечего.
+            .execution_options(synchronize_session=False)
         )
-        await self.db.execute(stmt)
+        result = await self.db.execute(stmt)
+        updated_dish = result.first()
         await self.db.commit()
+        return updated_dish
 
-    async def delete(self, submenu_id: str, dish_id: str):
-        stmt = delete(
-            model.Dish,
-        ).where(
-            model.Dish.id == dish_id,
-            model.Dish.submenu_id == submenu_id,
+    async def delete(self, menu_id: str, submenu_id: str, dish_id: str):
+        stmt = (
+            delete(
+                model.Dish,
+            )
+            .where(
+                model.Dish.id == dish_id,
+                model.Dish.submenu_id == submenu_id,
+                model.Submenu.id == model.Dish.submenu_id,
+                model.Submenu.menu_id == menu_id,
+            )
+            .returning(model.Dish.id)
+            .execution_options(synchronize_session=False)
         )
-        await self.db.execute(stmt)
+        result = await self.db.execute(stmt)
+        deleted_dish = result.first()
         await self.db.commit()
+        return deleted_dish
 
 
 def get_dish_crud(db: AsyncSession) -> DishCRUD:
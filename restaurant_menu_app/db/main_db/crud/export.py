@@ -0,0 +1,48 @@
+from sqlalchemy import column, select, table
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from config import EXPORT_BATCH_SIZE
+
+# Запрос выгрузки общий для API и воркера. Воркер собирается без моделей приложения,
+# поэтому таблицы описаны здесь только нужными для выгрузки колонками.
+menus = table("menus", column("id"), column("title"), column("description"))
+submenus = table("submenus", column("id"), column("menu_id"), column("title"), column("description"))
+dishes = table("dishes", column("id"), column("submenu_id"), column("title"), column("description"), column("price"))
+catalog_revision = table("catalog_revision", column("id"), column("revision"))
+
+REVISION_QUERY = select(catalog_revision.c.revision).where(catalog_revision.c.id == 1)
+
+EXPORT_QUERY = (
+    select(
+        menus.c.id.label("menu_id"),
+        menus.c.title.label("menu_title"),
+        menus.c.description.label("menu_description"),
+        submenus.c.id.label("submenu_id"),
+        submenus.c.title.label("submenu_title"),
+        submenus.c.description.label("submenu_description"),
+        dishes.c.id.label("dish_id"),
+        dishes.c.title.label("dish_title"),
+        dishes.c.description.label("dish_description"),
+        dishes.c.price.label("dish_price"),
+    )
+    .select_from(
+        menus.outerjoin(submenus, submenus.c.menu_id == menus.c.id).outerjoin(
+            dishes, dishes.c.submenu_id == submenus.c.id
+        )
+    )
+    .order_by(menus.c.id, submenus.c.id, dishes.c.id)
+)
+EXPORT_COLUMNS = [column.name for column in EXPORT_QUERY.selected_columns]
+
+
+async def fetch_revision(connection: AsyncConnection) -> int:
+    return await connection.scalar(REVISION_QUERY)
+
+
+async def fetch_records(connection: AsyncConnection, batch_size: int = EXPORT_BATCH_SIZE):
+    """Отдавать плоские строки каталога (меню, подменю, блюдо) меню за меню, читая серверным курсором пачками."""
+
+    result = await connection.stream(EXPORT_QUERY)
+    async for records in result.partitions(batch_size):
+        for record in records:
+            yield record
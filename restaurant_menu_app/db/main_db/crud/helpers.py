@@ -1,13 +1,17 @@
+from collections import Counter
+
 from fastapi.encoders import jsonable_encoder
-from sqlalchemy import func, select
+from sqlalchemy import func, insert, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from restaurant_menu_app.db.main_db.crud.export import fetch_records
 from restaurant_menu_app.models import model
 
 
 class HelperCRUD:
-    def __init__(self, db: AsyncSession) -> None:
+    def __init__(self, db: AsyncSession, read_db: AsyncSession | None = None) -> None:
         self.db = db
+        self.read_db = read_db or db
 
     async def get_all(self):
         query = select(
@@ -50,6 +54,60 @@ class HelperCRUD:
                 )
             )
         )
-        query_result = await self.db.execute(query)
+        query_result = await self.read_db.execute(query)
         result = jsonable_encoder(query_result.first())["json_agg"]
         return result
+
+    async def begin_snapshot(self) -> None:
+        """Перевести транзакцию сессии чтения в REPEATABLE READ: все следующие запросы видят один снимок каталога.
+
+        Вызывается до первого запроса в транзакции, иначе Postgres откажет.
+        """
+
+        await self.read_db.execute(text("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ"))
+
+    async def has_menus(self) -> bool:
+        return await self.read_db.scalar(select(select(model.Menu.id).exists()))
+
+    async def get_revision(self) -> int:
+        return await self.read_db.scalar(select(model.CatalogRevision.revision).where(model.CatalogRevision.id == 1))
+
+    async def count_dishes(self) -> int:
+        return await self.read_db.scalar(select(func.coalesce(func.sum(model.Menu.dishes_count), 0)))
+
+    async def stream_records(self):
+        """Плоские строки выгрузки из сессии чтения, теми же запросом и серверным курсором, что и в воркере."""
+
+        async for record in fetch_records(await self.read_db.connection()):
+            yield record
+
+    async def bulk_create(self, menus: list[dict], submenus: list[dict], dishes: list[dict], chunk_size: int):
+        """Вставить готовые строки всех уровней пакетами executemany в одной транзакции.
+
+        Строчные триггеры счётчиков в этой транзакции ничего не делают: счётчики считаются здесь же по готовым строкам
+        и пишутся вместе с ними, вместо двух UPDATE на каждое блюдо. Новые подменю и блюда ссылаются только
+        на новые меню и подменю, поэтому счётчики существующих строк не меняются.
+        """
+
+        dishes_per_submenu = Counter(dish["submenu_id"] for dish in dishes)
+        submenus_per_menu: Counter = Counter()
+        dishes_per_menu: Counter = Counter()
+        for submenu in submenus:
+            submenus_per_menu[submenu["menu_id"]] += 1
+            dishes_per_menu[submenu["menu_id"]] += dishes_per_submenu[submenu["id"]]
+        menus = [
+            {**menu, "submenus_count": submenus_per_menu[menu["id"]], "dishes_count": dishes_per_menu[menu["id"]]}
+            for menu in menus
+        ]
+        submenus = [{**submenu, "dishes_count": dishes_per_submenu[submenu["id"]]} for submenu in submenus]
+
+        # В отличие от ALTER TABLE ... DISABLE TRIGGER, настройка не требует прав владельца, не блокирует таблицы
+        # и действует только в этой транзакции, так что параллельные записи API считают счётчики как обычно.
+        await self.db.execute(text("SET LOCAL app.bulk_load = 'on'"))
+        for table, rows in ((model.Menu, menus), (model.Submenu, submenus), (model.Dish, dishes)):
+            for start in range(0, len(rows), chunk_size):
+                end = start + chunk_size
+                await self.db.execute(insert(table), rows[start:end])
+        # Следующие команды той же транзакции снова должны вести счётчики.
+        await self.db.execute(text("SET LOCAL app.bulk_load = 'off'"))
+        await self.db.commit()
@@ -1,79 +1,153 @@
-from sqlalchemy import delete, distinct, func, select, update
+from sqlalchemy import (
+    Numeric,
+    String,
+    Text,
+    cast,
+    delete,
+    func,
+    insert,
+    literal_column,
+    select,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from restaurant_menu_app.db.main_db.crud.abstract_crud import AbstractCRUD
 from restaurant_menu_app.models import model
 from restaurant_menu_app.schemas import scheme
 
+EMPTY_JSON_ARRAY = literal_column("'[]'::json")
+
 
 class MenuCRUD(AbstractCRUD):
-    def __init__(self, db: AsyncSession) -> None:
+    def __init__(self, db: AsyncSession, read_db: AsyncSession | None = None) -> None:
         self.db = db
+        self.read_db = read_db or db
 
-    async def read_all(self):
-        query = (
-            select(
-                model.Menu.id,
-                model.Menu.title,
-                model.Menu.description,
-                func.count(distinct(model.Submenu.id)).label("submenus_count"),
-                func.count(model.Dish.id).label("dishes_count"),
-            )
-            .outerjoin(
-                model.Submenu,
-                model.Submenu.menu_id == model.Menu.id,
-            )
-            .outerjoin(
-                model.Dish,
-                model.Dish.submenu_id == model.Submenu.id,
-            )
-            .group_by(
-                model.Menu.id,
-            )
+    async def read_all(self, limit: int | None = None, after: str | None = None):
+        query = select(
+            model.Menu.id,
+            model.Menu.title,
+            model.Menu.description,
+            model.Menu.submenus_count,
+            model.Menu.dishes_count,
         )
-        result = await self.db.execute(query)
+        if after:
+            query = query.where(model.Menu.id > after)
+        if limit:
+            query = query.order_by(model.Menu.id).limit(limit)
+        result = await self.read_db.execute(query)
         return result.all()
 
     async def read(self, menu_id: str):
-        query = (
+        query = select(
+            model.Menu.id,
+            model.Menu.title,
+            model.Menu.description,
+            model.Menu.submenus_count,
+            model.Menu.dishes_count,
+        ).where(
+            model.Menu.id == menu_id,
+        )
+        result = await self.read_db.execute(query)
+        return result.first()
+
+    async def read_tree(self, menu_id: str | None = None) -> str:
+        """Собрать дерево меню в формате API одним запросом и вернуть готовый JSON-текст.
+
+        Дерево не стримится: Postgres собирает его одним значением, и оно целиком кладётся в кэш.
+        Большие каталоги отдаёт выгрузка в файл.
+        """
+
+        dishes = (
             select(
-                model.Menu.id,
-                model.Menu.title,
-                model.Menu.description,
-                func.count(distinct(model.Submenu.id)).label("submenus_count"),
-                func.count(model.Dish.id).label("dishes_count"),
+                func.coalesce(
+                    func.json_agg(
+                        func.json_build_object(
+                            "id",
+                            model.Dish.id,
+                            "title",
+                            model.Dish.title,
+                            "description",
+                            model.Dish.description,
+                            "price",
+                            cast(func.round(cast(model.Dish.price, Numeric), 2), String),
+                        )
+                    ),
+                    EMPTY_JSON_ARRAY,
+                )
             )
-            .outerjoin(
-                model.Submenu,
-                model.Submenu.menu_id == model.Menu.id,
-            )
-            .outerjoin(
-                model.Dish,
-                model.Dish.submenu_id == model.Submenu.id,
+            .where(model.Dish.submenu_id == model.Submenu.id)
+            .scalar_subquery()
+        )
+        submenus = (
+            select(
+                func.coalesce(
+                    func.json_agg(
+                        func.json_build_object(
+                            "id",
+                            model.Submenu.id,
+                            "title",
+                            model.Submenu.title,
+                            "description",
+                            model.Submenu.description,
+                            "dishes_count",
+                            model.Submenu.dishes_count,
+                            "dishes",
+                            dishes,
+                        )
+                    ),
+                    EMPTY_JSON_ARRAY,
+                )
             )
-            .where(
-                model.Menu.id == menu_id,
+            .where(model.Submenu.menu_id == model.Menu.id)
+            .scalar_subquery()
+        )
+        menu = func.json_build_object(
+            "id",
+            model.Menu.id,
+            "title",
+            model.Menu.title,
+            "description",
+            model.Menu.description,
+            "submenus_count",
+            model.Menu.submenus_count,
+            "dishes_count",
+            model.Menu.dishes_count,
+            "submenus",
+            submenus,
+        )
+        if menu_id is None:
+            query = select(cast(func.coalesce(func.json_agg(menu), EMPTY_JSON_ARRAY), Text))
+        else:
+            query = select(cast(menu, Text)).where(model.Menu.id == menu_id)
+        result = await self.read_db.execute(query)
+        return result.scalar()
+
+    async def create(self, data: scheme.MenuCreate):
+        stmt = (
+            insert(
+                model.Menu,
             )
-            .group_by(
+            .values(**data.dict())
+            .returning(
                 model.Menu.id,
+                model.Menu.title,
+                model.Menu.description,
+                model.Menu.submenus_count,
+                model.Menu.dishes_count,
             )
         )
-        result = await self.db.execute(query)
-        return result.first()
-
-    async def create(self, data: scheme.MenuCreate):
-        new_menu = model.Menu(**data.dict())
-        self.db.add(new_menu)
+        result = await self.db.execute(stmt)
+        new_menu = result.first()
         await self.db.commit()
-        await self.db.refresh(new_menu)
         return new_menu
 
     async def update(self, menu_id: str, patch: scheme.MenuUpdate):
-        menu_to_update = await self.read(menu_id)
-        values = patch.dict(exclude_unset=True)
-        for key, value in values.items():
-            if not value:
-                values[key] = menu_to_update[key]
+        values = {key: value for key, value in patch.dict(exclude_unset=True).items() if value}
+        if not values:
+            return await self.read(menu_id)
+
         stmt = (
             update(
                 model.Menu,
@@ -82,14 +156,25 @@ class MenuCRUD(AbstractCRUD):
                 model.Menu.id == menu_id,
             )
             .values(**values)
+            .returning(
+                model.Menu.id,
+                model.Menu.title,
+                model.Menu.description,
+                model.Menu.submenus_count,
+                model.Menu.dishes_count,
+            )
         )
-        await self.db.execute(stmt)
+        result = await self.db.execute(stmt)
+        updated_menu = result.first()
         await self.db.commit()
+        return updated_menu
 
     async def delete(self, menu_id: str):
-        stmt = delete(model.Menu).where(model.Menu.id == menu_id)
-        await self.db.execute(stmt)
+        stmt = delete(model.Menu).where(model.Menu.id == menu_id).returning(model.Menu.id)
+        result = await self.db.execute(stmt)
+        deleted_menu = result.first()
         await self.db.commit()
+        return deleted_menu
 
 
 def get_menu_crud(db: AsyncSession) -> MenuCRUD:
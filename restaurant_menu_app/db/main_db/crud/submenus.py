@@ -1,4 +1,5 @@
-from sqlalchemy import delete, func, select, update
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from restaurant_menu_app.db.main_db.crud.abstract_crud import AbstractCRUD
@@ -7,64 +8,75 @@ from restaurant_menu_app.schemas import scheme
 
 
 class SubmenuCRUD(AbstractCRUD):
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, read_db: AsyncSession | None = None) -> None:
         self.db = db
+        self.read_db = read_db or db
 
-    async def read_all(self, menu_id: str):
-        query = (
-            select(
-                model.Submenu.id,
-                model.Submenu.title,
-                model.Submenu.description,
-                func.count(model.Dish.id).label("dishes_count"),
-            )
-            .join(
-                model.Menu,
-                model.Menu.id == model.Submenu.menu_id,
-            )
-            .outerjoin(
-                model.Dish,
-                model.Dish.submenu_id == model.Submenu.id,
-            )
-            .where(
-                model.Menu.id == menu_id,
-            )
-            .group_by(
-                model.Submenu.id,
-            )
+    async def read_all(self, menu_id: str, limit: int | None = None, after: str | None = None):
+        query = select(
+            model.Submenu.id,
+            model.Submenu.title,
+            model.Submenu.description,
+            model.Submenu.dishes_count,
+        ).where(
+            model.Submenu.menu_id == menu_id,
         )
-        result = await self.db.execute(query)
+        if after:
+            query = query.where(model.Submenu.id > after)
+        if limit:
+            query = query.order_by(model.Submenu.id).limit(limit)
+        result = await self.read_db.execute(query)
         return result.all()
 
     async def read(self, menu_id: str, submenu_id: str):
-        query = (
-            select(
+        query = select(
+            model.Submenu.id,
+            model.Submenu.title,
+            model.Submenu.description,
+            model.Submenu.dishes_count,
+        ).where(
+            model.Submenu.menu_id == menu_id,
+            model.Submenu.id == submenu_id,
+        )
+        result = await self.read_db.execute(query)
+        return result.first()
+
+    async def create(self, menu_id: str, data: scheme.SubmenuCreate):
+        stmt = (
+            insert(
+                model.Submenu,
+            )
+            .values(menu_id=menu_id, **data.dict())
+            .returning(
                 model.Submenu.id,
                 model.Submenu.title,
                 model.Submenu.description,
-                func.count(model.Dish.id).label("dishes_count"),
-            )
-            .outerjoin(
-                model.Dish,
-                model.Dish.submenu_id == model.Submenu.id,
+                model.Submenu.dishes_count,
             )
-            .where(
-                model.Submenu.menu_id == menu_id,
-                model.Submenu.id == submenu_id,
+        )
+        result = await self.db.execute(stmt)
+        new_submenu = result.first()
+        await self.db.commit()
+        return new_submenu
+
+    async def bulk_create(self, menu_id: str, data: list[scheme.SubmenuCreate]):
+        stmt = (
+            pg_insert(
+                model.Submenu,
             )
-            .group_by(
+            .values([{"menu_id": menu_id, **item.dict()} for item in data])
+            .on_conflict_do_nothing(constraint="_menu_submenu_uc")
+            .returning(
                 model.Submenu.id,
+                model.Submenu.title,
+                model.Submenu.description,
+                model.Submenu.dishes_count,
             )
         )
-        result = await self.db.execute(query)
-        return result.first()
-
-    async def create(self, menu_id: str, data: scheme.SubmenuCreate):
-        new_submenu = model.Submenu(menu_id=menu_id, **data.dict())
-        self.db.add(new_submenu)
+        result = await self.db.execute(stmt)
+        new_submenus = result.all()
         await self.db.commit()
-        await self.db.refresh(new_submenu)
-        return new_submenu
+        return new_submenus
 
     async def update(
         self,
@@ -72,11 +84,10 @@ class SubmenuCRUD(AbstractCRUD):
         submenu_id: str,
         patch: scheme.SubmenuUpdate,
     ):
-        submenu_to_update = await self.read(menu_id, submenu_id)
-        values = patch.dict(exclude_unset=True)
-        for key, value in values.items():
-            if not value:
-                values[key] = submenu_to_update[key]
+        values = {key: value for key, value in patch.dict(exclude_unset=True).items() if value}
+        if not values:
+            return await self.read(menu_id, submenu_id)
+
         stmt = (
             update(
                 model.Submenu,
@@ -86,19 +97,33 @@ class SubmenuCRUD(AbstractCRUD):
                 model.Submenu.menu_id == menu_id,
             )
             .values(**values)
+            .returning(
+                model.Submenu.id,
+                model.Submenu.title,
+                model.Submenu.description,
+                model.Submenu.dishes_count,
+            )
         )
-        await self.db.execute(stmt)
+        result = await self.db.execute(stmt)
+        updated_submenu = result.first()
         await self.db.commit()
+        return updated_submenu
 
     async def delete(self, menu_id: str, submenu_id: str):
-        stmt = delete(
-            model.Submenu,
-        ).where(
-            model.Submenu.id == submenu_id,
-            model.Submenu.menu_id == menu_id,
+        stmt = (
+            delete(
+                model.Submenu,
+            )
+            .where(
+                model.Submenu.id == submenu_id,
+                model.Submenu.menu_id == menu_id,
+            )
+            .returning(model.Submenu.id)
         )
-        await self.db.execute(stmt)
+        result = await self.db.execute(stmt)
+        deleted_submenu = result.first()
         await self.db.commit()
+        return deleted_submenu
 
 
 def get_submenu_crud(db: AsyncSession) -> SubmenuCRUD:
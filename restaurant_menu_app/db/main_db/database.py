@@ -1,21 +1,117 @@
+import time
+
+from fastapi import Depends, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
 
-from config import DB_HOST, DB_NAME, DB_PASS, DB_PORT, DB_USER
+from config import (
+    DB_ECHO,
+    DB_HOST,
+    DB_MAX_OVERFLOW,
+    DB_NAME,
+    DB_NULL_POOL,
+    DB_PASS,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    DB_PORT,
+    DB_PRIMARY_PIN_SECONDS,
+    DB_REPLICA_HOST,
+    DB_REPLICA_PORT,
+    DB_STATEMENT_CACHE_SIZE,
+    DB_USER,
+)
+from restaurant_menu_app.services.metrics import metrics
 
 SQLALCHEMY_DATABASE_URL = f"postgresql+asyncpg://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+SQLALCHEMY_REPLICA_URL = f"postgresql+asyncpg://{DB_USER}:{DB_PASS}@{DB_REPLICA_HOST}:{DB_REPLICA_PORT}/{DB_NAME}"
+
+REPLICA_ENABLED = bool(DB_REPLICA_HOST)
+PRIMARY_PIN_COOKIE = "db_primary"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
 
 Base = declarative_base()
 
-engine = create_async_engine(SQLALCHEMY_DATABASE_URL, echo=True)
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Пул соединений, который записывает время ожидания соединения в метрики."""
+
+    def _do_get(self):
+        started = time.monotonic()
+        try:
+            return super()._do_get()
+        finally:
+            metrics.observe("db_pool_checkout_seconds", time.monotonic() - started)
+
+
+def get_engine_options() -> dict:
+    options: dict = {
+        "echo": DB_ECHO,
+        "connect_args": {
+            "statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+        },
+    }
+    if DB_NULL_POOL:
+        options["poolclass"] = NullPool
+    else:
+        options.update(
+            poolclass=TimedQueuePool,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+            pool_pre_ping=DB_POOL_PRE_PING,
+        )
+    return options
+
+
+engine = create_async_engine(SQLALCHEMY_DATABASE_URL, **get_engine_options())
 async_session = sessionmaker(
     engine,
     class_=AsyncSession,
     expire_on_commit=False,
 )
 
+replica_engine = create_async_engine(SQLALCHEMY_REPLICA_URL, **get_engine_options()) if REPLICA_ENABLED else engine
+read_session = sessionmaker(
+    replica_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
+
+
+async def get_db(request: Request, response: Response):
+    """Сессия основной базы. Изменяющий запрос закрепляет клиента за ней на DB_PRIMARY_PIN_SECONDS."""
 
-async def get_db():
+    if REPLICA_ENABLED and request.method not in SAFE_METHODS:
+        response.set_cookie(PRIMARY_PIN_COOKIE, "1", max_age=DB_PRIMARY_PIN_SECONDS, httponly=True)
     async with async_session() as db:
         yield db
+
+
+async def get_read_db(request: Request, db: AsyncSession = Depends(get_db)):
+    """Сессия для чтения: реплика, если она настроена и клиент недавно ничего не изменял.
+
+    Изменяющие запросы и закреплённые клиенты читают из той же сессии основной базы,
+    чтобы видеть собственные записи, пока реплика их не догнала.
+    """
+
+    if not REPLICA_ENABLED or request.method not in SAFE_METHODS or PRIMARY_PIN_COOKIE in request.cookies:
+        yield db
+        return
+    async with read_session() as read_db:
+        yield read_db
+
+
+async def run_in_new_session(crud_class, method, *args):
+    """Выполнить чтение через CRUD в собственной сессии, не зависящей от сессии запроса.
+
+    Так обновляется кэш, поэтому читаем из основной базы: данные отстающей реплики прожили бы в кэше весь EXPIRE_TIME.
+    """
+
+    async with async_session() as db:
+        return await method(crud_class(db), *args)
@@ -1,9 +1,20 @@
+import logging
+
 from fastapi import FastAPI
 
 from restaurant_menu_app.api.v1.routers.dishes import router as dish_router
 from restaurant_menu_app.api.v1.routers.helpers import router as helpers_router
 from restaurant_menu_app.api.v1.routers.menus import router as menus_router
+from restaurant_menu_app.api.v1.routers.metrics import router as metrics_router
 from restaurant_menu_app.api.v1.routers.submenus import router as submenu_router
+from restaurant_menu_app.db.cache.cache_operations import (
+    start_invalidation_listener,
+    stop_invalidation_listener,
+)
+from restaurant_menu_app.db.cache.cache_settings import WARM_UP_ON_STARTUP
+from restaurant_menu_app.services.cache_warm_up import warm_up_cache
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI(
     title="Restaurant menu",
@@ -16,6 +27,22 @@ app.include_router(menus_router)
 app.include_router(submenu_router)
 app.include_router(dish_router)
 app.include_router(helpers_router)
+app.include_router(metrics_router)
+
+
+@app.on_event("startup")
+async def startup():
+    start_invalidation_listener()
+    if WARM_UP_ON_STARTUP:
+        try:
+            await warm_up_cache()
+        except Exception:
+            logger.exception("Cache warm-up failed")
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    await stop_invalidation_listener()
 
 
 @app.get(
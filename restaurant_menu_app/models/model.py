@@ -1,6 +1,18 @@
 import uuid
 
-from sqlalchemy import Column, Float, ForeignKey, MetaData, String, UniqueConstraint
+from sqlalchemy import (
+    DDL,
+    BigInteger,
+    Column,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    UniqueConstraint,
+    event,
+)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -12,9 +24,11 @@ metadata = MetaData()
 class Menu(Base):
     __tablename__ = "menus"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     title = Column(String, nullable=False, unique=True)
     description = Column(String, nullable=False)
+    submenus_count = Column(Integer, nullable=False, server_default="0")
+    dishes_count = Column(Integer, nullable=False, server_default="0")
 
     menu_submenus = relationship(
         "Submenu",
@@ -27,13 +41,14 @@ class Menu(Base):
 class Submenu(Base):
     __tablename__ = "submenus"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     menu_id = Column(
         ForeignKey("menus.id", ondelete="CASCADE"),
         nullable=False,
     )
     title = Column(String, nullable=False)
     description = Column(String, nullable=False)
+    dishes_count = Column(Integer, nullable=False, server_default="0")
 
     main_menu = relationship("Menu", back_populates="menu_submenus")
     submenu_dishes = relationship(
@@ -49,13 +64,19 @@ class Submenu(Base):
             "title",
             name="_menu_submenu_uc",
         ),
+        Index(
+            "ix_submenus_menu_id",
+            "menu_id",
+            "id",
+            postgresql_include=["title", "description", "dishes_count"],
+        ),
     )
 
 
 class Dish(Base):
     __tablename__ = "dishes"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     submenu_id = Column(
         ForeignKey("submenus.id", ondelete="CASCADE"),
         nullable=False,
@@ -72,4 +93,127 @@ class Dish(Base):
             "title",
             name="_submenu_dish_uc",
         ),
+        Index(
+            "ix_dishes_submenu_id",
+            "submenu_id",
+            "id",
+            postgresql_include=["title", "description", "price"],
+        ),
     )
+
+
+class CatalogRevision(Base):
+    """Единственная строка с версией каталога, которую триггеры увеличивают при любой записи в меню."""
+
+    __tablename__ = "catalog_revision"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    revision = Column(BigInteger, nullable=False, server_default="0")
+
+
+# Счётчики подменю и блюд поддерживаются триггерами, чтобы чтение меню не агрегировало блюда.
+# Пакетная загрузка считает их сама и выключает триггеры на свою транзакцию через SET LOCAL app.bulk_load = 'on'.
+# Те же объекты создаёт миграция 3f0c2a9d7b61; здесь они нужны для Base.metadata.create_all.
+submenus_counter_function = DDL(
+    """
+    CREATE OR REPLACE FUNCTION submenus_counter() RETURNS trigger AS $$
+    BEGIN
+        IF current_setting('app.bulk_load', true) = 'on' THEN
+            RETURN NULL;
+        END IF;
+        IF TG_OP = 'INSERT' THEN
+            UPDATE menus SET submenus_count = submenus_count + 1 WHERE id = NEW.menu_id;
+            RETURN NEW;
+        END IF;
+        UPDATE menus
+        SET submenus_count = submenus_count - 1, dishes_count = dishes_count - OLD.dishes_count
+        WHERE id = OLD.menu_id;
+        RETURN OLD;
+    END;
+    $$ LANGUAGE plpgsql
+    """
+)
+submenus_counter_trigger = DDL(
+    """
+    CREATE TRIGGER submenus_counter AFTER INSERT OR DELETE ON submenus
+    FOR EACH ROW EXECUTE FUNCTION submenus_counter()
+    """
+)
+
+dishes_counter_function = DDL(
+    """
+    CREATE OR REPLACE FUNCTION dishes_counter() RETURNS trigger AS $$
+    DECLARE
+        parent_menu_id UUID;
+    BEGIN
+        IF current_setting('app.bulk_load', true) = 'on' THEN
+            RETURN NULL;
+        END IF;
+        IF TG_OP = 'INSERT' THEN
+            UPDATE submenus SET dishes_count = dishes_count + 1 WHERE id = NEW.submenu_id
+            RETURNING menu_id INTO parent_menu_id;
+            UPDATE menus SET dishes_count = dishes_count + 1 WHERE id = parent_menu_id;
+            RETURN NEW;
+        END IF;
+        UPDATE submenus SET dishes_count = dishes_count - 1 WHERE id = OLD.submenu_id
+        RETURNING menu_id INTO parent_menu_id;
+        UPDATE menus SET dishes_count = dishes_count - 1 WHERE id = parent_menu_id;
+        RETURN OLD;
+    END;
+    $$ LANGUAGE plpgsql
+    """
+)
+dishes_counter_trigger = DDL(
+    """
+    CREATE TRIGGER dishes_counter AFTER INSERT OR DELETE ON dishes
+    FOR EACH ROW EXECUTE FUNCTION dishes_counter()
+    """
+)
+
+for table, ddl in (
+    (Submenu.__table__, submenus_counter_function),
+    (Submenu.__table__, submenus_counter_trigger),
+    (Dish.__table__, dishes_counter_function),
+    (Dish.__table__, dishes_counter_trigger),
+):
+    event.listen(table, "after_create", ddl.execute_if(dialect="postgresql"))
+
+# Версия каталога меняется в той же транзакции, что и данные, поэтому выгрузка, прочитавшая её в своём снимке,
+# однозначно описывает содержимое файла. Те же объекты создаёт миграция d4e8f2a6b1c7.
+catalog_revision_row = DDL("INSERT INTO catalog_revision (id, revision) VALUES (1, 0)")
+catalog_revision_function = DDL(
+    """
+    CREATE OR REPLACE FUNCTION bump_catalog_revision() RETURNS trigger AS $$
+    BEGIN
+        -- Команда, не затронувшая ни одной строки, версию не меняет. У TRUNCATE таблицы переходов нет.
+        IF TG_OP <> 'TRUNCATE' THEN
+            IF NOT EXISTS (SELECT FROM changed_rows) THEN
+                RETURN NULL;
+            END IF;
+        END IF;
+        UPDATE catalog_revision SET revision = revision + 1 WHERE id = 1;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """
+)
+# Таблицы переходов можно объявить только у триггера на одно событие, поэтому триггеров по одному на событие.
+CATALOG_REVISION_EVENTS = {
+    "INSERT": "REFERENCING NEW TABLE AS changed_rows",
+    "UPDATE": "REFERENCING NEW TABLE AS changed_rows",
+    "DELETE": "REFERENCING OLD TABLE AS changed_rows",
+    "TRUNCATE": "",
+}
+
+event.listen(CatalogRevision.__table__, "after_create", catalog_revision_row.execute_if(dialect="postgresql"))
+for table in (Menu.__table__, Submenu.__table__, Dish.__table__):
+    event.listen(table, "after_create", catalog_revision_function.execute_if(dialect="postgresql"))
+    for trigger_event, referencing in CATALOG_REVISION_EVENTS.items():
+        trigger = DDL(
+            f"""
+            CREATE TRIGGER {table.name}_catalog_revision_{trigger_event.lower()}
+            AFTER {trigger_event} ON {table.name} {referencing}
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_catalog_revision()
+            """
+        )
+        event.listen(table, "after_create", trigger.execute_if(dialect="postgresql"))
@@ -159,6 +159,40 @@ class DishUpdate(BaseModel):
         }
 
 
+# Tree schemas
+class SubmenuTree(SubmenuInfo):
+    dishes: list[DishInfo]
+
+
+class MenuTree(MenuInfo):
+    submenus: list[SubmenuTree]
+
+
+# Bulk schemas
+class BulkConflict(BaseModel):
+    index: int
+    title: str
+    detail: str
+
+
+class SubmenuBulkInfo(BaseModel):
+    created: list[SubmenuInfo]
+    conflicts: list[BulkConflict]
+
+
+class DishBulkInfo(BaseModel):
+    created: list[DishInfo]
+    conflicts: list[BulkConflict]
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "created": [DishInfo.Config.schema_extra["example"]],
+                "conflicts": [{"index": 1, "title": "My dish", "detail": "Dish with that title already exists"}],
+            },
+        }
+
+
 class Message(BaseModel):
     status: bool
     message: str
@@ -0,0 +1,19 @@
+from collections.abc import Sequence
+
+from restaurant_menu_app.schemas.scheme import BulkConflict
+
+
+def find_conflicts(data: Sequence, created: Sequence, detail: str) -> list[BulkConflict]:
+    """Найти элементы пакета, которые ON CONFLICT DO NOTHING не вставил.
+
+    Повтор названия внутри пакета тоже конфликт: вставлен только первый из них.
+    """
+
+    created_titles = {row.title for row in created}
+    conflicts = []
+    for index, item in enumerate(data):
+        if item.title in created_titles:
+            created_titles.remove(item.title)
+        else:
+            conflicts.append(BulkConflict(index=index, title=item.title, detail=detail))
+    return conflicts
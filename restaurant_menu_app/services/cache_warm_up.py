@@ -0,0 +1,87 @@
+import logging
+import time
+from collections import defaultdict
+
+from restaurant_menu_app.db.cache import cache_keys
+from restaurant_menu_app.db.cache.abstract_cache import AbstractCache
+from restaurant_menu_app.db.cache.cache_operations import get_response_cache
+from restaurant_menu_app.db.cache.cache_settings import EXPIRE_TIME, STALE_TIME
+from restaurant_menu_app.db.main_db.crud.helpers import HelperCRUD
+from restaurant_menu_app.db.main_db.database import async_session
+from restaurant_menu_app.schemas.scheme import DishInfo, MenuInfo, SubmenuInfo
+from restaurant_menu_app.services.metrics import metrics
+from restaurant_menu_app.services.responses import render
+
+logger = logging.getLogger(__name__)
+
+
+def build_cache_entries(tree: list[dict] | None) -> dict[tuple[tuple[str, ...], int], dict[str, bytes]]:
+    """Разложить дерево меню из HelperCRUD.get_all по ключам кэша готовыми телами ответов.
+
+    Записи сгруппированы по тегам и stale_time, чтобы каждую группу записать одним set_many.
+    """
+
+    groups: dict[tuple[tuple[str, ...], int], dict[str, bytes]] = defaultdict(dict)
+    menus = []
+    for menu in tree or []:
+        menu_id = menu["menu_id"]
+        menu_tags = (cache_keys.menu_tag(menu_id),)
+        submenus = []
+        menu_dishes_count = 0
+        for submenu in menu["child_submenus"] or []:
+            submenu_id = submenu["submenu_id"]
+            submenu_tags = (cache_keys.menu_tag(menu_id), cache_keys.submenu_tag(submenu_id))
+            dishes = [
+                {
+                    "id": dish["dish_id"],
+                    "title": dish["dish_title"],
+                    "description": dish["dish_description"],
+                    "price": dish["dish_price"],
+                }
+                for dish in submenu["child_dishes"] or []
+            ]
+            submenu_info = {
+                "id": submenu_id,
+                "title": submenu["submenu_title"],
+                "description": submenu["submenu_description"],
+                "dishes_count": len(dishes),
+            }
+            submenus.append(submenu_info)
+            menu_dishes_count += len(dishes)
+
+            groups[(submenu_tags, 0)][cache_keys.submenu(menu_id, submenu_id)] = render(SubmenuInfo, submenu_info)
+            groups[(submenu_tags, STALE_TIME)][cache_keys.dishes(menu_id, submenu_id)] = render(list[DishInfo], dishes)
+            for dish in dishes:
+                groups[(submenu_tags, 0)][cache_keys.dish(menu_id, submenu_id, dish["id"])] = render(DishInfo, dish)
+
+        menu_info = {
+            "id": menu_id,
+            "title": menu["menu_title"],
+            "description": menu["menu_description"],
+            "submenus_count": len(submenus),
+            "dishes_count": menu_dishes_count,
+        }
+        menus.append(menu_info)
+        groups[(menu_tags, 0)][cache_keys.menu(menu_id)] = render(MenuInfo, menu_info)
+        groups[(menu_tags, STALE_TIME)][cache_keys.submenus(menu_id)] = render(list[SubmenuInfo], submenus)
+
+    groups[((), STALE_TIME)][cache_keys.MENUS] = render(list[MenuInfo], menus)
+    return groups
+
+
+async def warm_up_cache(cache: AbstractCache | None = None):
+    """Загрузить всё дерево меню одним запросом и заполнить ключи списков и деталей."""
+
+    started = time.monotonic()
+    cache = cache or get_response_cache()
+    async with async_session() as db:
+        tree = await HelperCRUD(db).get_all()
+
+    groups = build_cache_entries(tree)
+    for (tags, stale_time), entries in groups.items():
+        await cache.set_many(entries, EXPIRE_TIME, tags, stale_time)
+
+    duration = time.monotonic() - started
+    metrics.set_gauge("cache_warm_up_seconds", duration)
+    metrics.set_gauge("cache_warm_up_keys", sum(len(entries) for entries in groups.values()))
+    logger.info("Cache warmed up in %.3f s", duration)
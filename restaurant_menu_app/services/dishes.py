@@ -1,15 +1,34 @@
+from functools import partial
 from http import HTTPStatus
 
 from fastapi import Depends, HTTPException
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from restaurant_menu_app.db.cache import cache_keys
 from restaurant_menu_app.db.cache.abstract_cache import AbstractCache
-from restaurant_menu_app.db.cache.cache_operations import get_cache
+from restaurant_menu_app.db.cache.cache_operations import (
+    ReplicaCache,
+    get_response_cache,
+)
+from restaurant_menu_app.db.cache.cache_settings import STALE_TIME
 from restaurant_menu_app.db.main_db.crud.abstract_crud import AbstractCRUD
 from restaurant_menu_app.db.main_db.crud.dishes import DishCRUD
-from restaurant_menu_app.db.main_db.database import get_db
-from restaurant_menu_app.schemas.scheme import DishCreate, DishInfo, DishUpdate, Message
+from restaurant_menu_app.db.main_db.database import (
+    get_db,
+    get_read_db,
+    run_in_new_session,
+)
+from restaurant_menu_app.schemas.scheme import (
+    DishBulkInfo,
+    DishCreate,
+    DishInfo,
+    DishUpdate,
+    Message,
+)
+from restaurant_menu_app.services.bulk import find_conflicts
+from restaurant_menu_app.services.pagination import decode_cursor, load_page
+from restaurant_menu_app.services.responses import load_rendered, render
 
 
 class DishService:
@@ -17,36 +36,75 @@ class DishService:
         self.dish_crud = dish_crud
         self.cache = cache
 
-    async def get_list(self, menu_id: str, submenu_id: str) -> list[DishInfo]:
-        """Получить список блюд."""
+    @staticmethod
+    def list_pages_tags(menu_id: str, submenu_id: str) -> tuple[str, ...]:
+        """Теги страниц всех списков, в которых меняются блюдо или его счётчики."""
 
-        if await self.cache.is_cached("dishes"):
-            return await self.cache.get("dishes")
-
-        dishes = await self.dish_crud.read_all(menu_id, submenu_id)
-        await self.cache.set("dishes", dishes)
-        return dishes
+        return (
+            cache_keys.pages_tag(cache_keys.dishes(menu_id, submenu_id)),
+            cache_keys.pages_tag(cache_keys.submenus(menu_id)),
+            cache_keys.pages_tag(cache_keys.MENUS),
+        )
 
-    async def get_info(self, menu_id: str, submenu_id: str, dish_id: str) -> DishInfo:
-        """Полчить информациб о блюде."""
+    async def get_list(self, menu_id: str, submenu_id: str) -> bytes:
+        """Получить список блюд готовым телом ответа."""
+
+        return await self.cache.get_or_load(
+            cache_keys.dishes(menu_id, submenu_id),
+            partial(load_rendered, list[DishInfo], partial(self.dish_crud.read_all, menu_id, submenu_id)),
+            tags=(cache_keys.menu_tag(menu_id), cache_keys.submenu_tag(submenu_id)),
+            stale_time=STALE_TIME,
+            refresher=partial(
+                load_rendered,
+                list[DishInfo],
+                partial(run_in_new_session, DishCRUD, DishCRUD.read_all, menu_id, submenu_id),
+            ),
+        )
 
-        if await self.cache.is_cached(dish_id):
-            return await self.cache.get(dish_id)
+    async def get_page(self, menu_id: str, submenu_id: str, limit: int, cursor: str | None) -> bytes:
+        """Получить страницу списка блюд после курсора."""
+
+        after = decode_cursor(cursor)
+        list_key = cache_keys.dishes(menu_id, submenu_id)
+        return await self.cache.get_or_load(
+            cache_keys.page(list_key, limit, cursor),
+            partial(load_page, list[DishInfo], partial(self.dish_crud.read_all, menu_id, submenu_id), limit, after),
+            tags=(cache_keys.menu_tag(menu_id), cache_keys.submenu_tag(submenu_id), cache_keys.pages_tag(list_key)),
+            stale_time=STALE_TIME,
+            refresher=partial(
+                load_page,
+                list[DishInfo],
+                partial(run_in_new_session, DishCRUD, DishCRUD.read_all, menu_id, submenu_id),
+                limit,
+                after,
+            ),
+        )
 
-        dish = await self.dish_crud.read(menu_id, submenu_id, dish_id)
+    async def get_info(self, menu_id: str, submenu_id: str, dish_id: str) -> bytes:
+        """Полчить информациб о блюде готовым телом ответа."""
+
+        dish = await self.cache.get_or_load(
+            cache_keys.dish(menu_id, submenu_id, dish_id),
+            partial(load_rendered, DishInfo, partial(self.dish_crud.read, menu_id, submenu_id, dish_id)),
+            tags=(cache_keys.menu_tag(menu_id), cache_keys.submenu_tag(submenu_id)),
+            refresher=partial(
+                load_rendered,
+                DishInfo,
+                partial(run_in_new_session, DishCRUD, DishCRUD.read, menu_id, submenu_id, dish_id),
+            ),
+        )
         if not dish:
             raise HTTPException(
                 status_code=HTTPStatus.NOT_FOUND,
                 detail="dish not found",
             )
-        await self.cache.set(dish_id, dish)
         return dish
 
     async def create(self, menu_id: str, submenu_id: str, data: DishCreate) -> DishInfo:
         """Создать блюдо."""
 
         try:
-            new_dish = await self.dish_crud.create(submenu_id, data)
+            created_dish = await self.dish_crud.create(menu_id, submenu_id, data)
         except IntegrityError as e:
             if "UniqueViolationError" in str(e.orig):
                 raise HTTPException(
@@ -60,57 +118,120 @@ class DishService:
                 )
             else:
                 raise
+        if not created_dish:
+            raise HTTPException(
+                status_code=HTTPStatus.BAD_REQUEST,
+                detail="parent submenu not found",
+            )
 
-        created_dish = await self.dish_crud.read(
-            menu_id,
-            submenu_id,
-            new_dish.id,
+        await self.cache.set(
+            cache_keys.dish(menu_id, submenu_id, created_dish.id),
+            render(DishInfo, created_dish),
+            tags=(cache_keys.menu_tag(menu_id), cache_keys.submenu_tag(submenu_id)),
+        )
+        await self.cache.invalidate_tags(
+            cache_keys.TREE_TAG,
+            *self.list_pages_tags(menu_id, submenu_id),
+            keys=(
+                cache_keys.dishes(menu_id, submenu_id),
+                cache_keys.submenu(menu_id, submenu_id),
+                cache_keys.submenus(menu_id),
+                cache_keys.menu(menu_id),
+                cache_keys.MENUS,
+            ),
         )
-        await self.cache.set(str(created_dish.id), created_dish)
-        await self.cache.clear(submenu_id)
-        await self.cache.clear(menu_id)
-        await self.cache.clear("dishes")
-        await self.cache.clear("submenus")
-        await self.cache.clear("menus")
         return created_dish
 
+    async def bulk_create(self, menu_id: str, submenu_id: str, data: list[DishCreate]) -> DishBulkInfo:
+        """Создать пакет блюд одним запросом, пропустив конфликтующие названия."""
+
+        try:
+            created_dishes = await self.dish_crud.bulk_create(menu_id, submenu_id, data)
+        except IntegrityError as e:
+            if "ForeignKeyViolationError" in str(e.orig):
+                raise HTTPException(
+                    status_code=HTTPStatus.BAD_REQUEST,
+                    detail="parent submenu not found",
+                )
+            else:
+                raise
+        if created_dishes is None:
+            raise HTTPException(
+                status_code=HTTPStatus.BAD_REQUEST,
+                detail="parent submenu not found",
+            )
+
+        if created_dishes:
+            await self.cache.set_many(
+                {cache_keys.dish(menu_id, submenu_id, dish.id): render(DishInfo, dish) for dish in created_dishes},
+                tags=(cache_keys.menu_tag(menu_id), cache_keys.submenu_tag(submenu_id)),
+            )
+            await self.cache.invalidate_tags(
+                cache_keys.TREE_TAG,
+                *self.list_pages_tags(menu_id, submenu_id),
+                keys=(
+                    cache_keys.dishes(menu_id, submenu_id),
+                    cache_keys.submenu(menu_id, submenu_id),
+                    cache_keys.submenus(menu_id),
+                    cache_keys.menu(menu_id),
+                    cache_keys.MENUS,
+                ),
+            )
+        return DishBulkInfo(
+            created=created_dishes,
+            conflicts=find_conflicts(data, created_dishes, "Dish with that title already exists"),
+        )
+
     async def update(self, menu_id: str, submenu_id: str, dish_id: str, patch: DishUpdate) -> DishInfo:
         """Обновить блюдо."""
 
-        if not await self.dish_crud.read(menu_id, submenu_id, dish_id):
+        updated_dish = await self.dish_crud.update(menu_id, submenu_id, dish_id, patch)
+        if not updated_dish:
             raise HTTPException(
                 status_code=HTTPStatus.NOT_FOUND,
                 detail="dish not found",
             )
-
-        await self.dish_crud.update(menu_id, submenu_id, dish_id, patch)
-        updated_dish = await self.dish_crud.read(menu_id, submenu_id, dish_id)
-        await self.cache.set(dish_id, updated_dish)
-        await self.cache.clear("dishes")
+        await self.cache.set(
+            cache_keys.dish(menu_id, submenu_id, dish_id),
+            render(DishInfo, updated_dish),
+            tags=(cache_keys.menu_tag(menu_id), cache_keys.submenu_tag(submenu_id)),
+        )
+        await self.cache.invalidate_tags(
+            cache_keys.TREE_TAG,
+            cache_keys.pages_tag(cache_keys.dishes(menu_id, submenu_id)),
+            keys=(cache_keys.dishes(menu_id, submenu_id),),
+        )
         return updated_dish
 
     async def delete(self, menu_id: str, submenu_id: str, dish_id: str) -> Message:
         """Удалить блюдо."""
 
-        if not await self.dish_crud.read(menu_id, submenu_id, dish_id):
+        if not await self.dish_crud.delete(menu_id, submenu_id, dish_id):
             raise HTTPException(
                 status_code=HTTPStatus.NOT_FOUND,
                 detail="dish not found",
             )
-
-        await self.dish_crud.delete(submenu_id, dish_id)
-        await self.cache.clear(dish_id)
-        await self.cache.clear(submenu_id)
-        await self.cache.clear(menu_id)
-        await self.cache.clear("dishes")
-        await self.cache.clear("submenus")
-        await self.cache.clear("menus")
+        await self.cache.invalidate_tags(
+            cache_keys.TREE_TAG,
+            *self.list_pages_tags(menu_id, submenu_id),
+            keys=(
+                cache_keys.dish(menu_id, submenu_id, dish_id),
+                cache_keys.dishes(menu_id, submenu_id),
+                cache_keys.submenu(menu_id, submenu_id),
+                cache_keys.submenus(menu_id),
+                cache_keys.menu(menu_id),
+                cache_keys.MENUS,
+            ),
+        )
         return Message(status=True, message="The dish has been deleted")
 
 
 def get_dish_service(
     db: AsyncSession = Depends(get_db),
-    cache: AbstractCache = Depends(get_cache),
+    read_db: AsyncSession = Depends(get_read_db),
+    cache: AbstractCache = Depends(get_response_cache),
 ) -> DishService:
-    dish_crud = DishCRUD(db=db)
+    dish_crud = DishCRUD(db=db, read_db=read_db)
+    if read_db is not db:
+        cache = ReplicaCache(cache)
     return DishService(dish_crud=dish_crud, cache=cache)
@@ -1,18 +1,21 @@
 import json
+import uuid
 from http import HTTPStatus
 from pathlib import Path
 
 import aiofiles  # type: ignore
 from fastapi import Depends, HTTPException
-from fastapi.responses import FileResponse
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from restaurant_menu_app.db.main_db.crud.abstract_crud import AbstractCRUD
-from restaurant_menu_app.db.main_db.crud.dishes import DishCRUD
+from config import EXPORT_CACHE_TIME, EXPORT_STREAM_MAX_DISHES, SEED_CHUNK_SIZE
+from restaurant_menu_app.db.cache import cache_keys
+from restaurant_menu_app.db.cache.abstract_cache import AbstractCache
+from restaurant_menu_app.db.cache.cache_operations import get_cache
 from restaurant_menu_app.db.main_db.crud.helpers import HelperCRUD
-from restaurant_menu_app.db.main_db.crud.menus import MenuCRUD
-from restaurant_menu_app.db.main_db.crud.submenus import SubmenuCRUD
-from restaurant_menu_app.db.main_db.database import get_db
+from restaurant_menu_app.db.main_db.database import get_db, get_read_db
 from restaurant_menu_app.schemas.scheme import (
     DishCreate,
     MenuCreate,
@@ -20,6 +23,77 @@ from restaurant_menu_app.schemas.scheme import (
     SubmenuCreate,
 )
 from restaurant_menu_app.tasks import tasks
+from restaurant_menu_app.tasks.writers import MEDIA_TYPES, STREAMERS, ExportFormat
+
+
+def flatten_tree(data: list[dict]) -> tuple[list[dict], list[dict], list[dict]]:
+    """Разложить дерево меню на строки таблиц, сразу назначив id, чтобы не ждать их от базы."""
+
+    menus: list[dict] = []
+    submenus: list[dict] = []
+    dishes: list[dict] = []
+    for menu in data:
+        menu_id = uuid.uuid4()
+        menus.append({"id": menu_id, **MenuCreate(**menu).dict()})
+        for submenu in menu["submenus"]:
+            submenu_id = uuid.uuid4()
+            submenus.append({"id": submenu_id, "menu_id": menu_id, **SubmenuCreate(**submenu).dict()})
+            for dish in submenu["dishes"]:
+                dishes.append({"id": uuid.uuid4(), "submenu_id": submenu_id, **DishCreate(**dish).dict()})
+    return menus, submenus, dishes
+
+
+def generate_rows(
+    menus_count: int,
+    submenus_count: int,
+    dishes_count: int,
+) -> tuple[list[dict], list[dict], list[dict]]:
+    """Сгенерировать строки синтетического дерева меню заданного размера для нагрузочного тестирования."""
+
+    run_id = uuid.uuid4().hex[:8]
+    menus: list[dict] = []
+    submenus: list[dict] = []
+    dishes: list[dict] = []
+    for menu_number in range(menus_count):
+        menu_id = uuid.uuid4()
+        menus.append({"id": menu_id, "title": f"Generated menu {run_id}-{menu_number}", "description": "Generated"})
+        for submenu_number in range(submenus_count):
+            submenu_id = uuid.uuid4()
+            submenus.append(
+                {
+                    "id": submenu_id,
+                    "menu_id": menu_id,
+                    "title": f"Generated submenu {submenu_number}",
+                    "description": "Generated",
+                },
+            )
+            dishes.extend(
+                {
+                    "id": uuid.uuid4(),
+                    "submenu_id": submenu_id,
+                    "title": f"Generated dish {dish_number}",
+                    "description": "Generated",
+                    "price": float(100 + dish_number % 100),
+                }
+                for dish_number in range(dishes_count)
+            )
+    return menus, submenus, dishes
+
+
+def export_file_path(file_name: str) -> Path:
+    return Path("src").parent.absolute().joinpath("data", file_name)
+
+
+def is_reusable_export(task_id: str, file_name: str) -> bool:
+    """Задачу можно отдать повторно, если файл этой версии уже лежит на диске или она ещё выполняется.
+
+    rpc-бэкенд знает состояние только задач, отправленных этим процессом: чужая задача или задача,
+    отправленная до перезапуска, навсегда остаётся PENDING, поэтому PENDING повторно не отдаём.
+    """
+
+    if export_file_path(file_name).exists():
+        return True
+    return tasks.get_result(task_id).state == "STARTED"
 
 
 class HelperServise:
@@ -27,48 +101,97 @@ class HelperServise:
         self,
         db: AsyncSession,
         helper_crud: HelperCRUD,
-        menu_crud: AbstractCRUD,
-        submenu_crud: AbstractCRUD,
-        dish_crud: AbstractCRUD,
+        cache: AbstractCache,
     ) -> None:
         self.db = db
         self.helper_crud = helper_crud
-        self.menu_crud = menu_crud
-        self.submenu_crud = submenu_crud
-        self.dish_crud = dish_crud
+        self.cache = cache
 
-    async def put_all_data_to_file(self) -> Message:
-        data = await self.helper_crud.get_all()
-        if data is None:
+    async def put_all_data_to_file(self, export_format: ExportFormat = ExportFormat.xlsx) -> Message:
+        """Поставить выгрузку в очередь: данные воркер читает из базы сам, в задаче передаются только параметры."""
+
+        if not await self.helper_crud.has_menus():
             raise HTTPException(
                 status_code=HTTPStatus.BAD_REQUEST,
                 detail="Database is empty!",
             )
 
-        task = tasks.save_data_to_file.delay(data)
-        return Message(status=True, message=f"Task registred with ID: {task.id}")
+        # Пока версия каталога не изменилась, повторный запрос получает ту же задачу и тот же файл.
+        revision = await self.helper_crud.get_revision()
+        export_key = cache_keys.export(export_format.value, revision)
+        file_name = tasks.export_file_name(revision, export_format)
+        task_id = await self.cache.get_or_none(export_key)
+        if task_id is None or not is_reusable_export(task_id, file_name):
+            task_id = tasks.save_data_to_file.delay(export_format.value).id
+            # Имя файла хранится в Redis, чтобы его отдал любой процесс API, а не только отправивший задачу.
+            await self.cache.set_many(
+                {export_key: task_id, cache_keys.export_file(task_id): file_name},
+                EXPORT_CACHE_TIME,
+            )
+        return Message(status=True, message=f"Task registred with ID: {task_id}")
 
-    def get_all_data_in_file(self, task_id: str):
+    async def stream_data(self, export_format: ExportFormat = ExportFormat.csv) -> Response:
+        """Небольшой каталог отдать прямо в ответе, большой выгрузить фоновой задачей, как POST /content_as_file.
+
+        Проверки, версия в имени файла и сами строки читаются из одного снимка, как в воркере.
+        """
+
+        await self.helper_crud.begin_snapshot()
+        if export_format not in STREAMERS or await self.helper_crud.count_dishes() > EXPORT_STREAM_MAX_DISHES:
+            message = await self.put_all_data_to_file(export_format)
+            return JSONResponse(jsonable_encoder(message), status_code=HTTPStatus.ACCEPTED)
+
+        if not await self.helper_crud.has_menus():
+            raise HTTPException(
+                status_code=HTTPStatus.BAD_REQUEST,
+                detail="Database is empty!",
+            )
+
+        filename = tasks.export_file_name(await self.helper_crud.get_revision(), export_format)
+        return StreamingResponse(
+            STREAMERS[export_format](self.helper_crud.stream_records()),
+            media_type=MEDIA_TYPES[export_format],
+            headers={"Content-Disposition": f"attachment; filename={filename}"},
+        )
+
+    async def get_all_data_in_file(self, task_id: str):
         task = tasks.get_result(task_id)
-        if task.ready():
+        # У упавшей задачи в result лежит исключение, поэтому имя файла из результата берём только у успешной.
+        if task.successful():
             filename = task.result["file_name"]
-            filepath = str(Path("src").parent.absolute().joinpath("data", filename))
-            return FileResponse(
-                path=filepath,
-                media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                headers={"Content-Disposition": f"attachment; filename={filename}"},
-            )
         else:
-            return {"task_id": task_id, "status": task.status}
+            filename = await self.cache.get_or_none(cache_keys.export_file(task_id))
+        if filename is not None:
+            filepath = export_file_path(filename)
+            if filepath.exists():
+                return FileResponse(
+                    path=str(filepath),
+                    media_type=MEDIA_TYPES[ExportFormat(filepath.suffix.lstrip("."))],
+                    headers={"Content-Disposition": f"attachment; filename={filename}"},
+                )
+        return {"task_id": task_id, "status": task.status}
+
+    async def generate_test_data(self, menus: int = 0, submenus: int = 0, dishes: int = 0) -> Message:
+        if menus:
+            rows = generate_rows(menus, submenus, dishes)
+        else:
+            rows = flatten_tree(await self.get_data_from_source())
 
-    async def generate_test_data(self) -> Message:
-        data = await self.get_data_from_source()
         try:
-            await self.create_items(data)
+            await self.helper_crud.bulk_create(*rows, chunk_size=SEED_CHUNK_SIZE)
+        except IntegrityError as e:
+            await self.db.rollback()
+            if "UniqueViolationError" in str(e.orig):
+                raise HTTPException(
+                    status_code=HTTPStatus.BAD_REQUEST,
+                    detail="Test data already exists",
+                )
+            raise
         except Exception:
             await self.db.rollback()
             raise
 
+        await self.cache.flush()
         return Message(status=True, message="test data created")
 
     async def get_data_from_source(self):
@@ -78,34 +201,15 @@ class HelperServise:
             data1 = json.loads(data)
         return data1
 
-    async def create_items(self, data, parent_id=None):
-        for item in data:
-            if "submenus" in item.keys():
-                menu_to_create = MenuCreate(title=item["title"], description=item["description"])
-                created_menu = await self.menu_crud.create(data=menu_to_create)
-                child_submenus = [submenu for submenu in item["submenus"]]
-                await self.create_items(child_submenus, parent_id=created_menu.id)
-
-            elif "dishes" in item.keys():
-                submenu_to_create = SubmenuCreate(title=item["title"], description=item["description"])
-                created_submenu = await self.submenu_crud.create(menu_id=parent_id, data=submenu_to_create)
-                child_dishes = [dish for dish in item["dishes"]]
-                await self.create_items(child_dishes, parent_id=created_submenu.id)
-
-            else:
-                dish_to_create = DishCreate(title=item["title"], description=item["description"], price=item["price"])
-                await self.dish_crud.create(submenu_id=parent_id, data=dish_to_create)
-
-
-def get_helper_service(db: AsyncSession = Depends(get_db)) -> HelperServise:
-    helper_crud = HelperCRUD(db=db)
-    menu_crud = MenuCRUD(db=db)
-    submenu_crud = SubmenuCRUD(db=db)
-    dish_crud = DishCRUD(db=db)
+
+def get_helper_service(
+    db: AsyncSession = Depends(get_db),
+    read_db: AsyncSession = Depends(get_read_db),
+    cache: AbstractCache = Depends(get_cache),
+) -> HelperServise:
+    helper_crud = HelperCRUD(db=db, read_db=read_db)
     return HelperServise(
         db=db,
         helper_crud=helper_crud,
-        menu_crud=menu_crud,
-        submenu_crud=submenu_crud,
-        dish_crud=dish_crud,
+        cache=cache,
     )
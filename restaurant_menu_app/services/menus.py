@@ -1,15 +1,27 @@
+from functools import partial
 from http import HTTPStatus
 
 from fastapi import Depends, HTTPException
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from restaurant_menu_app.db.cache import cache_keys
 from restaurant_menu_app.db.cache.abstract_cache import AbstractCache
-from restaurant_menu_app.db.cache.cache_operations import get_cache
+from restaurant_menu_app.db.cache.cache_operations import (
+    ReplicaCache,
+    get_response_cache,
+)
+from restaurant_menu_app.db.cache.cache_settings import STALE_TIME
 from restaurant_menu_app.db.main_db.crud.abstract_crud import AbstractCRUD
 from restaurant_menu_app.db.main_db.crud.menus import MenuCRUD
-from restaurant_menu_app.db.main_db.database import get_db
+from restaurant_menu_app.db.main_db.database import (
+    get_db,
+    get_read_db,
+    run_in_new_session,
+)
 from restaurant_menu_app.schemas.scheme import MenuCreate, MenuInfo, MenuUpdate, Message
+from restaurant_menu_app.services.pagination import decode_cursor, load_page
+from restaurant_menu_app.services.responses import load_rendered, load_text, render
 
 
 class MenuService:
@@ -17,36 +29,79 @@ class MenuService:
         self.menu_crud = menu_crud
         self.cache = cache
 
-    async def get_list(self) -> list[MenuInfo]:
-        """Получить список меню."""
-
-        if await self.cache.is_cached("menus"):
-            return await self.cache.get("menus")
-
-        menus = await self.menu_crud.read_all()
-        await self.cache.set("menus", menus)
-        return menus
+    async def get_list(self) -> bytes:
+        """Получить список меню готовым телом ответа."""
+
+        return await self.cache.get_or_load(
+            cache_keys.MENUS,
+            partial(load_rendered, list[MenuInfo], self.menu_crud.read_all),
+            stale_time=STALE_TIME,
+            refresher=partial(load_rendered, list[MenuInfo], partial(run_in_new_session, MenuCRUD, MenuCRUD.read_all)),
+        )
+
+    async def get_page(self, limit: int, cursor: str | None) -> bytes:
+        """Получить страницу списка меню после курсора."""
+
+        after = decode_cursor(cursor)
+        return await self.cache.get_or_load(
+            cache_keys.page(cache_keys.MENUS, limit, cursor),
+            partial(load_page, list[MenuInfo], self.menu_crud.read_all, limit, after),
+            tags=(cache_keys.pages_tag(cache_keys.MENUS),),
+            stale_time=STALE_TIME,
+            refresher=partial(
+                load_page,
+                list[MenuInfo],
+                partial(run_in_new_session, MenuCRUD, MenuCRUD.read_all),
+                limit,
+                after,
+            ),
+        )
+
+    async def get_info(self, menu_id: str) -> bytes:
+        """Получить информацию о меню готовым телом ответа."""
+
+        menu = await self.cache.get_or_load(
+            cache_keys.menu(menu_id),
+            partial(load_rendered, MenuInfo, partial(self.menu_crud.read, menu_id)),
+            tags=(cache_keys.menu_tag(menu_id),),
+            refresher=partial(load_rendered, MenuInfo, partial(run_in_new_session, MenuCRUD, MenuCRUD.read, menu_id)),
+        )
+        if not menu:
+            raise HTTPException(
+                status_code=HTTPStatus.NOT_FOUND,
+                detail="menu not found",
+            )
+        return menu
 
-    async def get_info(self, menu_id: str) -> MenuInfo:
-        """Получить информацию о меню."""
+    async def get_tree(self, menu_id: str | None = None) -> bytes:
+        """Получить дерево меню с подменю и блюдами готовым JSON-текстом."""
 
-        if await self.cache.is_cached(menu_id):
-            return await self.cache.get(menu_id)
+        if menu_id is None:
+            return await self.cache.get_or_load(
+                cache_keys.TREE,
+                partial(load_text, self.menu_crud.read_tree),
+                tags=(cache_keys.TREE_TAG,),
+                refresher=partial(load_text, partial(run_in_new_session, MenuCRUD, MenuCRUD.read_tree)),
+            )
 
-        menu = await self.menu_crud.read(menu_id)
-        if not menu:
+        tree = await self.cache.get_or_load(
+            cache_keys.menu_tree(menu_id),
+            partial(load_text, partial(self.menu_crud.read_tree, menu_id)),
+            tags=(cache_keys.TREE_TAG, cache_keys.menu_tag(menu_id)),
+            refresher=partial(load_text, partial(run_in_new_session, MenuCRUD, MenuCRUD.read_tree, menu_id)),
+        )
+        if not tree:
             raise HTTPException(
                 status_code=HTTPStatus.NOT_FOUND,
                 detail="menu not found",
             )
-        await self.cache.set(menu_id, menu)
-        return menu
+        return tree
 
     async def create(self, data: MenuCreate) -> MenuInfo:
         """Cоздать меню."""
 
         try:
-            new_menu = await self.menu_crud.create(data)
+            created_menu = await self.menu_crud.create(data)
         except IntegrityError as e:
             if "UniqueViolationError" in str(e.orig):
                 raise HTTPException(
@@ -56,44 +111,62 @@ class MenuService:
             else:
                 raise
 
-        created_menu = await self.menu_crud.read(new_menu.id)
-        await self.cache.set(str(created_menu.id), created_menu)
-        await self.cache.clear("menus")
+        await self.cache.set(
+            cache_keys.menu(created_menu.id),
+            render(MenuInfo, created_menu),
+            tags=(cache_keys.menu_tag(created_menu.id),),
+        )
+        await self.cache.invalidate_tags(
+            cache_keys.TREE_TAG,
+            cache_keys.pages_tag(cache_keys.MENUS),
+            keys=(cache_keys.MENUS,),
+        )
         return created_menu
 
     async def update(self, menu_id: str, patch: MenuUpdate) -> MenuInfo:
         """Обновить меню."""
 
-        if not await self.menu_crud.read(menu_id):
+        updated_menu = await self.menu_crud.update(menu_id, patch)
+        if not updated_menu:
             raise HTTPException(
                 status_code=HTTPStatus.NOT_FOUND,
                 detail="menu not found",
             )
-
-        await self.menu_crud.update(menu_id, patch)
-        updated_menu = await self.menu_crud.read(menu_id)
-        await self.cache.set(menu_id, updated_menu)
-        await self.cache.clear("menus")
+        await self.cache.set(
+            cache_keys.menu(menu_id),
+            render(MenuInfo, updated_menu),
+            tags=(cache_keys.menu_tag(menu_id),),
+        )
+        await self.cache.invalidate_tags(
+            cache_keys.TREE_TAG,
+            cache_keys.pages_tag(cache_keys.MENUS),
+            keys=(cache_keys.MENUS,),
+        )
         return updated_menu
 
     async def delete(self, menu_id: str) -> Message:
         """Удалить меню."""
 
-        if not await self.menu_crud.read(menu_id):
+        if not await self.menu_crud.delete(menu_id):
             raise HTTPException(
                 status_code=HTTPStatus.NOT_FOUND,
                 detail="menu not found",
             )
-
-        await self.menu_crud.delete(menu_id)
-        await self.cache.clear(menu_id)
-        await self.cache.clear("menus")
+        await self.cache.invalidate_tags(
+            cache_keys.TREE_TAG,
+            cache_keys.menu_tag(menu_id),
+            cache_keys.pages_tag(cache_keys.MENUS),
+            keys=(cache_keys.menu(menu_id), cache_keys.MENUS),
+        )
         return Message(status=True, message="The menu has been deleted")
 
 
 def get_menu_service(
     db: AsyncSession = Depends(get_db),
-    cache: AbstractCache = Depends(get_cache),
+    read_db: AsyncSession = Depends(get_read_db),
+    cache: AbstractCache = Depends(get_response_cache),
 ) -> MenuService:
-    menu_crud = MenuCRUD(db=db)
+    menu_crud = MenuCRUD(db=db, read_db=read_db)
+    if read_db is not db:
+        cache = ReplicaCache(cache)
     return MenuService(menu_crud=menu_crud, cache=cache)
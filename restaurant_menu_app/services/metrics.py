@@ -0,0 +1,24 @@
+class Metrics:
+    """Простые метрики процесса: последние значения и агрегаты наблюдений."""
+
+    def __init__(self) -> None:
+        self.gauges: dict[str, float] = {}
+        self.observations: dict[str, dict[str, float]] = {}
+
+    def set_gauge(self, name: str, value: float):
+        self.gauges[name] = value
+
+    def observe(self, name: str, value: float):
+        summary = self.observations.setdefault(name, {"count": 0, "sum": 0.0, "max": 0.0})
+        summary["count"] += 1
+        summary["sum"] += value
+        summary["max"] = max(summary["max"], value)
+
+    def snapshot(self) -> dict:
+        result: dict = dict(self.gauges)
+        for name, summary in self.observations.items():
+            result[name] = {**summary, "avg": summary["sum"] / summary["count"]}
+        return result
+
+
+metrics = Metrics()
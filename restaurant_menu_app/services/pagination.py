@@ -0,0 +1,55 @@
+import base64
+import binascii
+from collections.abc import Awaitable, Callable
+from http import HTTPStatus
+from typing import Any
+from uuid import UUID
+
+from fastapi import HTTPException
+
+from restaurant_menu_app.services.responses import render
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(last_id) -> str:
+    return base64.urlsafe_b64encode(str(last_id).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str | None) -> str | None:
+    """Получить id последней строки предыдущей страницы из непрозрачного курсора."""
+
+    if cursor is None:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return str(UUID(base64.urlsafe_b64decode(padded).decode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail="invalid cursor",
+        )
+
+
+async def load_page(
+    list_schema: Any,
+    read_all: Callable[..., Awaitable[list]],
+    limit: int,
+    after: str | None,
+) -> bytes:
+    """Прочитать страницу на одну строку больше limit, чтобы узнать, есть ли следующая.
+
+    Возвращает готовое тело ответа, перед которым в первой строке записан курсор следующей страницы.
+    """
+
+    rows = await read_all(limit + 1, after)
+    next_cursor = encode_cursor(rows[limit - 1].id) if len(rows) > limit else ""
+    return next_cursor.encode() + b"\n" + render(list_schema, rows[:limit])
+
+
+def unpack_page(page: bytes) -> tuple[bytes, dict[str, str]]:
+    """Отделить тело страницы от курсора и вернуть курсор заголовком ответа."""
+
+    next_cursor, _, body = page.partition(b"\n")
+    headers = {NEXT_CURSOR_HEADER: next_cursor.decode()} if next_cursor else {}
+    return body, headers
@@ -0,0 +1,35 @@
+from collections.abc import Awaitable, Callable
+from http import HTTPStatus
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
+from pydantic import parse_obj_as
+
+
+def render(schema: Any, value: Any) -> bytes:
+    """Провалидировать значение схемой ответа и закодировать его так же, как это делает FastAPI."""
+
+    return JSONResponse(jsonable_encoder(parse_obj_as(schema, value))).body
+
+
+async def load_rendered(schema: Any, loader: Callable[[], Awaitable[Any]]) -> bytes | None:
+    """Загрузить значение и сразу превратить его в тело ответа; None означает, что объекта нет."""
+
+    value = await loader()
+    if value is None:
+        return None
+    return render(schema, value)
+
+
+def json_response(body: bytes, headers: dict[str, str] | None = None) -> Response:
+    return Response(content=body, status_code=HTTPStatus.OK, media_type="application/json", headers=headers)
+
+
+async def load_text(loader: Callable[[], Awaitable[str | None]]) -> bytes | None:
+    """Загрузить JSON, уже собранный базой данных, и взять его как тело ответа без разбора."""
+
+    value = await loader()
+    if value is None:
+        return None
+    return value.encode()
@@ -1,20 +1,34 @@
+from functools import partial
 from http import HTTPStatus
 
 from fastapi import Depends, HTTPException
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from restaurant_menu_app.db.cache import cache_keys
 from restaurant_menu_app.db.cache.abstract_cache import AbstractCache
-from restaurant_menu_app.db.cache.cache_operations import get_cache
+from restaurant_menu_app.db.cache.cache_operations import (
+    ReplicaCache,
+    get_response_cache,
+)
+from restaurant_menu_app.db.cache.cache_settings import STALE_TIME
 from restaurant_menu_app.db.main_db.crud.abstract_crud import AbstractCRUD
 from restaurant_menu_app.db.main_db.crud.submenus import SubmenuCRUD
-from restaurant_menu_app.db.main_db.database import get_db
+from restaurant_menu_app.db.main_db.database import (
+    get_db,
+    get_read_db,
+    run_in_new_session,
+)
 from restaurant_menu_app.schemas.scheme import (
     Message,
+    SubmenuBulkInfo,
     SubmenuCreate,
     SubmenuInfo,
     SubmenuUpdate,
 )
+from restaurant_menu_app.services.bulk import find_conflicts
+from restaurant_menu_app.services.pagination import decode_cursor, load_page
+from restaurant_menu_app.services.responses import load_rendered, render
 
 
 class SubmenuService:
@@ -22,36 +36,64 @@ class SubmenuService:
         self.submenu_crud = submenu_crud
         self.cache = cache
 
-    async def get_list(self, menu_id: str) -> list[SubmenuInfo]:
-        """Получить список подменю."""
-
-        if await self.cache.is_cached("submenus"):
-            return await self.cache.get("submenus")
-
-        submenus = await self.submenu_crud.read_all(menu_id)
-        await self.cache.set("submenus", submenus)
-        return submenus
-
-    async def get_info(self, menu_id: str, submenu_id: str) -> SubmenuInfo:
-        """Получить информацию о подменю."""
-
-        if await self.cache.is_cached(submenu_id):
-            return await self.cache.get(submenu_id)
-
-        submenu = await self.submenu_crud.read(menu_id, submenu_id)
+    async def get_list(self, menu_id: str) -> bytes:
+        """Получить список подменю готовым телом ответа."""
+
+        return await self.cache.get_or_load(
+            cache_keys.submenus(menu_id),
+            partial(load_rendered, list[SubmenuInfo], partial(self.submenu_crud.read_all, menu_id)),
+            tags=(cache_keys.menu_tag(menu_id),),
+            stale_time=STALE_TIME,
+            refresher=partial(
+                load_rendered,
+                list[SubmenuInfo],
+                partial(run_in_new_session, SubmenuCRUD, SubmenuCRUD.read_all, menu_id),
+            ),
+        )
+
+    async def get_page(self, menu_id: str, limit: int, cursor: str | None) -> bytes:
+        """Получить страницу списка подменю после курсора."""
+
+        after = decode_cursor(cursor)
+        return await self.cache.get_or_load(
+            cache_keys.page(cache_keys.submenus(menu_id), limit, cursor),
+            partial(load_page, list[SubmenuInfo], partial(self.submenu_crud.read_all, menu_id), limit, after),
+            tags=(cache_keys.menu_tag(menu_id), cache_keys.pages_tag(cache_keys.submenus(menu_id))),
+            stale_time=STALE_TIME,
+            refresher=partial(
+                load_page,
+                list[SubmenuInfo],
+                partial(run_in_new_session, SubmenuCRUD, SubmenuCRUD.read_all, menu_id),
+                limit,
+                after,
+            ),
+        )
+
+    async def get_info(self, menu_id: str, submenu_id: str) -> bytes:
+        """Получить информацию о подменю готовым телом ответа."""
+
+        submenu = await self.cache.get_or_load(
+            cache_keys.submenu(menu_id, submenu_id),
+            partial(load_rendered, SubmenuInfo, partial(self.submenu_crud.read, menu_id, submenu_id)),
+            tags=(cache_keys.menu_tag(menu_id), cache_keys.submenu_tag(submenu_id)),
+            refresher=partial(
+                load_rendered,
+                SubmenuInfo,
+                partial(run_in_new_session, SubmenuCRUD, SubmenuCRUD.read, menu_id, submenu_id),
+            ),
+        )
         if not submenu:
             raise HTTPException(
                 status_code=HTTPStatus.NOT_FOUND,
                 detail="submenu not found",
             )
-        await self.cache.set(submenu_id, submenu)
         return submenu
 
     async def create(self, menu_id: str, data: SubmenuCreate) -> SubmenuInfo:
         """Создать подменю."""
 
         try:
-            new_submenu = await self.submenu_crud.create(menu_id, data)
+            created_submenu = await self.submenu_crud.create(menu_id, data)
         except IntegrityError as e:
             if "UniqueViolationError" in str(e.orig):
                 raise HTTPException(
@@ -66,48 +108,112 @@ class SubmenuService:
             else:
                 raise
 
-        created_submenu = await self.submenu_crud.read(menu_id, new_submenu.id)
-        await self.cache.set(str(created_submenu.id), created_submenu)
-        await self.cache.clear(menu_id)
-        await self.cache.clear("submenus")
-        await self.cache.clear("menus")
+        await self.cache.set(
+            cache_keys.submenu(menu_id, created_submenu.id),
+            render(SubmenuInfo, created_submenu),
+            tags=(cache_keys.menu_tag(menu_id), cache_keys.submenu_tag(created_submenu.id)),
+        )
+        await self.cache.invalidate_tags(
+            cache_keys.TREE_TAG,
+            cache_keys.pages_tag(cache_keys.submenus(menu_id)),
+            cache_keys.pages_tag(cache_keys.MENUS),
+            keys=(
+                cache_keys.submenus(menu_id),
+                cache_keys.menu(menu_id),
+                cache_keys.MENUS,
+            ),
+        )
         return created_submenu
 
+    async def bulk_create(self, menu_id: str, data: list[SubmenuCreate]) -> SubmenuBulkInfo:
+        """Создать пакет подменю одним запросом, пропустив конфликтующие названия."""
+
+        try:
+            created_submenus = await self.submenu_crud.bulk_create(menu_id, data)
+        except IntegrityError as e:
+            if "ForeignKeyViolationError" in str(e.orig):
+                raise HTTPException(
+                    status_code=HTTPStatus.BAD_REQUEST,
+                    detail="parent menu not found",
+                )
+            else:
+                raise
+
+        if created_submenus:
+            # Весь пакет пишется одним конвейером, поэтому ключи помечены тегами всех новых подменю сразу:
+            # изменение одного из них лишь заодно сбросит кэш соседей по пакету.
+            await self.cache.set_many(
+                {cache_keys.submenu(menu_id, submenu.id): render(SubmenuInfo, submenu) for submenu in created_submenus},
+                tags=(
+                    cache_keys.menu_tag(menu_id),
+                    *(cache_keys.submenu_tag(submenu.id) for submenu in created_submenus),
+                ),
+            )
+            await self.cache.invalidate_tags(
+                cache_keys.TREE_TAG,
+                cache_keys.pages_tag(cache_keys.submenus(menu_id)),
+                cache_keys.pages_tag(cache_keys.MENUS),
+                keys=(
+                    cache_keys.submenus(menu_id),
+                    cache_keys.menu(menu_id),
+                    cache_keys.MENUS,
+                ),
+            )
+        return SubmenuBulkInfo(
+            created=created_submenus,
+            conflicts=find_conflicts(data, created_submenus, "Submenu with that title already exists"),
+        )
+
     async def update(self, menu_id: str, submenu_id: str, patch: SubmenuUpdate) -> SubmenuInfo:
         """Обновить подменю."""
 
-        if not await self.submenu_crud.read(menu_id, submenu_id):
+        updated_submenu = await self.submenu_crud.update(menu_id, submenu_id, patch)
+        if not updated_submenu:
             raise HTTPException(
                 status_code=HTTPStatus.NOT_FOUND,
                 detail="submenu not found",
             )
-
-        await self.submenu_crud.update(menu_id, submenu_id, patch)
-        updated_submenu = await self.submenu_crud.read(menu_id, submenu_id)
-        await self.cache.set(submenu_id, updated_submenu)
-        await self.cache.clear("submenus")
+        await self.cache.set(
+            cache_keys.submenu(menu_id, submenu_id),
+            render(SubmenuInfo, updated_submenu),
+            tags=(cache_keys.menu_tag(menu_id), cache_keys.submenu_tag(submenu_id)),
+        )
+        await self.cache.invalidate_tags(
+            cache_keys.TREE_TAG,
+            cache_keys.pages_tag(cache_keys.submenus(menu_id)),
+            keys=(cache_keys.submenus(menu_id),),
+        )
         return updated_submenu
 
     async def delete(self, menu_id: str, submenu_id: str) -> Message:
         """Удалить подменю."""
 
-        if not await self.submenu_crud.read(menu_id, submenu_id):
+        if not await self.submenu_crud.delete(menu_id, submenu_id):
             raise HTTPException(
                 status_code=HTTPStatus.NOT_FOUND,
                 detail="submenu not found",
             )
-
-        await self.submenu_crud.delete(menu_id, submenu_id)
-        await self.cache.clear(submenu_id)
-        await self.cache.clear(menu_id)
-        await self.cache.clear("submenus")
-        await self.cache.clear("menus")
+        await self.cache.invalidate_tags(
+            cache_keys.TREE_TAG,
+            cache_keys.submenu_tag(submenu_id),
+            cache_keys.pages_tag(cache_keys.submenus(menu_id)),
+            cache_keys.pages_tag(cache_keys.MENUS),
+            keys=(
+                cache_keys.submenu(menu_id, submenu_id),
+                cache_keys.submenus(menu_id),
+                cache_keys.menu(menu_id),
+                cache_keys.MENUS,
+            ),
+        )
         return Message(status=True, message="The submenu has been deleted")
 
 
 def get_submenu_service(
     db: AsyncSession = Depends(get_db),
-    cache: AbstractCache = Depends(get_cache),
+    read_db: AsyncSession = Depends(get_read_db),
+    cache: AbstractCache = Depends(get_response_cache),
 ) -> SubmenuService:
-    submenu_crud = SubmenuCRUD(db=db)
+    submenu_crud = SubmenuCRUD(db=db, read_db=read_db)
+    if read_db is not db:
+        cache = ReplicaCache(cache)
     return SubmenuService(submenu_crud=submenu_crud, cache=cache)
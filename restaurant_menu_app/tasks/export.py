@@ -0,0 +1,22 @@
+from contextlib import asynccontextmanager
+
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from config import DB_HOST, DB_NAME, DB_PASS, DB_PORT, DB_USER
+
+EXPORT_DATABASE_URL = f"postgresql+asyncpg://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+
+
+@asynccontextmanager
+async def open_snapshot():
+    """Открыть транзакцию REPEATABLE READ: версия каталога и строки выгрузки читаются из одного снимка."""
+
+    engine = create_async_engine(EXPORT_DATABASE_URL, poolclass=NullPool)
+    try:
+        async with engine.connect() as connection:
+            connection = await connection.execution_options(isolation_level="REPEATABLE READ")
+            async with connection.begin():
+                yield connection
+    finally:
+        await engine.dispose()
@@ -1,16 +1,27 @@
-from datetime import datetime
-from pathlib import PurePath
+import asyncio
+import os
+import uuid
+from pathlib import Path
+
+from config import EXPORT_KEEP_FILES
+from restaurant_menu_app.db.main_db.crud.export import fetch_records, fetch_revision
+from restaurant_menu_app.tasks.export import open_snapshot
+from restaurant_menu_app.tasks.tasks_app import celery_app
+from restaurant_menu_app.tasks.writers import WRITERS, ExportFormat
 
-import openpyxl
+DATA_DIR = Path(__file__).parent.parent.parent.joinpath("data")
+FILE_PREFIX = "restaurant_menu_r"
 
-from restaurant_menu_app.tasks.tasks_app import celery_app
+
+def export_file_name(revision: int, export_format: ExportFormat) -> str:
+    return f"{FILE_PREFIX}{revision}.{export_format.value}"
 
 
 @celery_app.task(track_started=True)
-def save_data_to_file(data: dict):
-    file_name = f"{datetime.now().strftime('%d-%m-%Y-%H-%M')}_restaurant_menu.xlsx"
-    file_path = str(PurePath(__file__).parent.parent.parent.joinpath("data", file_name))
-    save_to_xlsx(data, file_path)
+def save_data_to_file(export_format: str = ExportFormat.xlsx.value):
+    file_format = ExportFormat(export_format)
+    file_name = asyncio.run(export_catalog(file_format, DATA_DIR))
+    prune_exports(DATA_DIR, file_format, EXPORT_KEEP_FILES)
     return {"file_name": file_name}
 
 
@@ -19,37 +30,34 @@ def get_result(task_id: str):
     return task
 
 
-def save_to_xlsx(data: dict, file_name: str):
-    menus = data
-    book = openpyxl.Workbook()
-    sheet = book.active
-    menu_row, menu_column, menu_counter = 1, 1, 1
-    for menu in menus:
-        sheet.cell(menu_row, menu_column).value = menu_counter
-        sheet.cell(menu_row, menu_column + 1).value = menu["menu_title"]
-        sheet.cell(menu_row, menu_column + 2).value = menu["menu_description"]
-        menu_counter += 1
-        submenu_row = menu_row + 1
-        submenu_column = menu_column + 1
-        submenu_counter = 1
-        if menu["child_submenus"]:
-            for submenu in menu["child_submenus"]:
-                sheet.cell(submenu_row, submenu_column).value = submenu_counter
-                sheet.cell(submenu_row, submenu_column + 1).value = submenu["submenu_title"]
-                sheet.cell(submenu_row, submenu_column + 2).value = submenu["submenu_description"]
-                submenu_counter += 1
-                dish_row = submenu_row + 1
-                dish_column = submenu_column + 1
-                dish_counter = 1
-                if submenu["child_dishes"]:
-                    for dish in submenu["child_dishes"]:
-                        sheet.cell(dish_row, dish_column).value = dish_counter
-                        sheet.cell(dish_row, dish_column + 1).value = dish["dish_title"]
-                        sheet.cell(dish_row, dish_column + 2).value = dish["dish_description"]
-                        sheet.cell(dish_row, dish_column + 3).value = dish["dish_price"]
-                        dish_counter += 1
-                        dish_row += 1
-                submenu_row = dish_row
-        menu_row = submenu_row
-    book.save(file_name)
-    book.close()
+async def export_catalog(export_format: ExportFormat, directory: Path) -> str:
+    """Выгрузить каталог в файл, названный по версии каталога; если файл этой версии уже есть, вернуть его."""
+
+    async with open_snapshot() as connection:
+        file_name = export_file_name(await fetch_revision(connection), export_format)
+        file_path = directory.joinpath(file_name)
+        if file_path.exists():
+            # Обновляем время изменения, чтобы prune_exports не удалил файл, который снова запросили.
+            file_path.touch()
+            return file_name
+
+        # Пишем во временный файл и переименовываем, чтобы параллельная выгрузка не отдала недописанный файл.
+        tmp_path = directory.joinpath(f".{file_name}.{uuid.uuid4().hex}.tmp")
+        try:
+            await WRITERS[export_format](fetch_records(connection), str(tmp_path))
+            os.replace(tmp_path, file_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+    return file_name
+
+
+def prune_exports(directory: Path, export_format: ExportFormat, keep: int):
+    """Оставить только keep последних выгрузок этого формата."""
+
+    files = sorted(
+        directory.glob(f"{FILE_PREFIX}*.{export_format.value}"),
+        key=lambda path: path.stat().st_mtime,
+        reverse=True,
+    )
+    for path in files[keep:]:
+        path.unlink(missing_ok=True)
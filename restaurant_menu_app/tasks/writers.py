@@ -0,0 +1,136 @@
+import csv
+import io
+import json
+from collections.abc import AsyncIterable, Awaitable, Callable
+from enum import Enum
+from uuid import UUID
+
+import openpyxl
+
+from config import EXPORT_BATCH_SIZE
+from restaurant_menu_app.db.main_db.crud.export import EXPORT_COLUMNS
+
+
+class ExportFormat(str, Enum):
+    xlsx = "xlsx"
+    csv = "csv"
+    jsonl = "jsonl"
+    parquet = "parquet"
+
+
+MEDIA_TYPES = {
+    ExportFormat.xlsx: "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    ExportFormat.csv: "text/csv",
+    ExportFormat.jsonl: "application/x-ndjson",
+    ExportFormat.parquet: "application/vnd.apache.parquet",
+}
+
+
+async def iter_rows(records: AsyncIterable):
+    """Превратить упорядоченные строки выгрузки в строки листа: меню, под ним подменю, под каждым подменю блюда."""
+
+    menu_id = submenu_id = None
+    menu_counter = submenu_counter = dish_counter = 0
+    async for record in records:
+        if record.menu_id != menu_id:
+            menu_id, submenu_id = record.menu_id, None
+            menu_counter += 1
+            submenu_counter = 0
+            yield (menu_counter, record.menu_title, record.menu_description)
+        if record.submenu_id is not None and record.submenu_id != submenu_id:
+            submenu_id = record.submenu_id
+            submenu_counter += 1
+            dish_counter = 0
+            yield (None, submenu_counter, record.submenu_title, record.submenu_description)
+        if record.dish_id is not None:
+            dish_counter += 1
+            yield (None, None, dish_counter, record.dish_title, record.dish_description, record.dish_price)
+
+
+async def iter_batches(records: AsyncIterable, batch_size: int):
+    batch = []
+    async for record in records:
+        batch.append(record)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def to_plain(record) -> tuple:
+    """Привести id к строкам, чтобы строку можно было записать в текстовые и колоночные форматы."""
+
+    return tuple(str(value) if isinstance(value, UUID) else value for value in record)
+
+
+async def save_to_xlsx(records: AsyncIterable, file_name: str):
+    """Записать строки в книгу в режиме write-only: openpyxl сбрасывает их на диск, не держа лист в памяти."""
+
+    book = openpyxl.Workbook(write_only=True)
+    sheet = book.create_sheet()
+    async for row in iter_rows(records):
+        sheet.append(row)
+    book.save(file_name)
+    book.close()
+
+
+async def iter_csv(records: AsyncIterable, batch_size: int = EXPORT_BATCH_SIZE):
+    """Отдавать csv кусками по batch_size строк, чтобы его можно было и писать в файл, и отдавать в ответе."""
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    async for batch in iter_batches(records, batch_size):
+        writer.writerows(to_plain(record) for record in batch)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+async def iter_jsonl(records: AsyncIterable, batch_size: int = EXPORT_BATCH_SIZE):
+    async for batch in iter_batches(records, batch_size):
+        yield "".join(
+            json.dumps(dict(zip(EXPORT_COLUMNS, to_plain(record))), ensure_ascii=False) + "\n" for record in batch
+        )
+
+
+async def save_to_csv(records: AsyncIterable, file_name: str):
+    with open(file_name, "w", newline="", encoding="utf-8") as file:
+        async for chunk in iter_csv(records):
+            file.write(chunk)
+
+
+async def save_to_jsonl(records: AsyncIterable, file_name: str):
+    with open(file_name, "w", encoding="utf-8") as file:
+        async for chunk in iter_jsonl(records):
+            file.write(chunk)
+
+
+async def save_to_parquet(records: AsyncIterable, file_name: str, batch_size: int = EXPORT_BATCH_SIZE):
+    """Записать строки в parquet пачками по batch_size: каждая пачка становится отдельной группой строк."""
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([(name, pa.float64() if name == "dish_price" else pa.string()) for name in EXPORT_COLUMNS])
+    with pq.ParquetWriter(file_name, schema) as writer:
+        async for batch in iter_batches(records, batch_size):
+            columns = zip(*(to_plain(record) for record in batch))
+            writer.write_batch(pa.record_batch([list(column) for column in columns], schema=schema))
+
+
+WRITERS: dict[ExportFormat, Callable[[AsyncIterable, str], Awaitable[None]]] = {
+    ExportFormat.xlsx: save_to_xlsx,
+    ExportFormat.csv: save_to_csv,
+    ExportFormat.jsonl: save_to_jsonl,
+    ExportFormat.parquet: save_to_parquet,
+}
+
+# Книгу xlsx openpyxl собирает синхронно и целиком, поэтому прямо в ответе отдаются только текстовые форматы.
+STREAMERS = {
+    ExportFormat.csv: iter_csv,
+    ExportFormat.jsonl: iter_jsonl,
+}
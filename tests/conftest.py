@@ -88,7 +88,7 @@ async def fixture_dish(db, fixture_menu, fixture_submenu):
     dish_crud = DishCRUD(db)
     menu = fixture_menu
     submenu = fixture_submenu[1]
-    dish = await dish_crud.create(submenu.id, scheme.DishCreate(**new_dish))
+    dish = await dish_crud.create(menu.id, submenu.id, scheme.DishCreate(**new_dish))
     return menu.id, submenu.id, await dish_crud.read(menu.id, submenu.id, dish.id)
 
 
@@ -4,4 +4,5 @@ fake_id = uuid.uuid4()
 new_submenu = {"title": "Soups", "description": "just soups"}
 upd_submenu = {"title": "Updated soups", "description": "brand new soups"}
 submenu_not_found = {"detail": "submenu not found"}
+other_menu_data = {"title": "Other menu", "description": "menu without submenus"}
 submenu_deleted = {"status": True, "message": "The submenu has been deleted"}
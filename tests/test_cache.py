@@ -0,0 +1,238 @@
+import asyncio
+import sys
+import uuid
+from unittest.mock import AsyncMock, patch
+
+import aioredis
+import pytest
+import pytest_asyncio
+from sqlalchemy.engine.result import result_tuple
+
+from config import REDIS_DB, REDIS_HOST, REDIS_PORT
+from restaurant_menu_app.db.cache.cache_operations import (
+    Cache,
+    FallbackCache,
+    ReplicaCache,
+    TwoTierCache,
+    _background_tasks,
+    single_flight,
+)
+from restaurant_menu_app.db.cache.cache_settings import (
+    INSTANCE_ID,
+    INVALIDATION_CHANNEL,
+    LOCK_PREFIX,
+)
+from restaurant_menu_app.db.cache.circuit_breaker import CircuitBreaker
+from restaurant_menu_app.db.cache.local_cache import LocalCache
+from restaurant_menu_app.db.cache.serializers import JSONSerializer, get_serializer
+
+
+@pytest_asyncio.fixture
+async def redis_cache():
+    redis_client = aioredis.from_url(f"redis://{REDIS_HOST}:{REDIS_PORT}", db=REDIS_DB)
+    yield Cache(cache_client=redis_client)
+    await redis_client.flushdb()
+    await redis_client.close()
+
+
+def test_local_cache_hit_and_miss():
+    cache = LocalCache(max_size=2, ttl=10)
+    cache.set("menus", [])
+
+    assert cache.get("menus") == []
+    assert cache.get("submenus") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_local_cache_evicts_least_recently_used():
+    cache = LocalCache(max_size=2, ttl=10)
+    cache.set("first", 1)
+    cache.set("second", 2)
+    cache.get("first")
+    cache.set("third", 3)
+
+    assert cache.get("second") is None
+    assert cache.get("first") == 1
+    assert cache.get("third") == 3
+
+
+def test_local_cache_expires_entries():
+    cache = LocalCache(max_size=2, ttl=10)
+    with patch("restaurant_menu_app.db.cache.local_cache.time.monotonic", return_value=0):
+        cache.set("menus", [])
+    with patch("restaurant_menu_app.db.cache.local_cache.time.monotonic", return_value=11):
+        assert cache.get("menus") is None
+
+
+@pytest.mark.asyncio
+async def test_set_many_writes_keys_tags_and_ttl(redis_cache):
+    redis_client = redis_cache.redis_client
+
+    await redis_cache.set_many({"menu:1": {"id": 1}, "menu:2": {"id": 2}}, expire_time=10, tags=("menu:1", "menus"))
+
+    assert await redis_cache.get("menu:1") == {"id": 1}
+    assert await redis_cache.get("menu:2") == {"id": 2}
+    assert 0 < await redis_client.ttl("menu:1") <= 10
+    assert await redis_client.smembers("tag:menus") == {b"menu:1", b"menu:2"}
+    assert await redis_client.smembers("tag:menu:1") == {b"menu:1", b"menu:2"}
+    assert 0 < await redis_client.ttl("tag:menus") <= 10
+
+
+@pytest.mark.asyncio
+async def test_set_many_adds_stale_time_to_ttl(redis_cache):
+    await redis_cache.set_many({"menus": []}, expire_time=10, stale_time=20)
+
+    assert 10 < await redis_cache.redis_client.ttl("menus") <= 30
+
+
+@pytest.mark.asyncio
+async def test_tag_ttl_is_not_shortened(redis_cache):
+    await redis_cache.set_many({"menu:1": 1}, expire_time=100, tags=("menus",))
+    await redis_cache.set_many({"menu:2": 2}, expire_time=10, tags=("menus",))
+
+    assert 10 < await redis_cache.redis_client.ttl("tag:menus") <= 100
+
+
+@pytest.mark.asyncio
+async def test_stale_value_is_served_and_refreshed_once(redis_cache):
+    await redis_cache.set("menus", "old", expire_time=0, stale_time=10)
+    refreshed = asyncio.Event()
+
+    async def refresh():
+        await refreshed.wait()
+        return "new"
+
+    refresher = AsyncMock(side_effect=refresh)
+    loader = AsyncMock(return_value="loaded")
+
+    first = await redis_cache.get_or_load("menus", loader, expire_time=10, stale_time=10, refresher=refresher)
+    second = await redis_cache.get_or_load("menus", loader, expire_time=10, stale_time=10, refresher=refresher)
+    refreshed.set()
+    await asyncio.gather(*_background_tasks)
+
+    assert first == second == "old"
+    refresher.assert_awaited_once()
+    loader.assert_not_awaited()
+    assert await redis_cache.get("menus") == "new"
+    assert not await redis_cache.redis_client.exists(LOCK_PREFIX + "menus")
+
+
+@pytest.mark.asyncio
+async def test_clear_many_deletes_only_given_keys(redis_cache):
+    await redis_cache.set_many({"menu:1": 1, "menu:2": 2, "menu:3": 3}, expire_time=10)
+
+    await redis_cache.clear_many("menu:1", "menu:2")
+    await redis_cache.clear_many()
+
+    assert not await redis_cache.is_cached("menu:1")
+    assert not await redis_cache.is_cached("menu:2")
+    assert await redis_cache.get("menu:3") == 3
+
+
+@pytest.mark.asyncio
+async def test_replica_cache_does_not_store_replica_reads():
+    cache = AsyncMock()
+    cache.get_or_none.return_value = None
+    loader = AsyncMock(return_value=b"[]")
+
+    assert await ReplicaCache(cache).get_or_load("menus", loader) == b"[]"
+    cache.get_or_load.assert_not_awaited()
+    cache.set.assert_not_awaited()
+
+    cache.get_or_none.return_value = b"[1]"
+    assert await ReplicaCache(cache).get_or_load("menus", loader) == b"[1]"
+    loader.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_replica_cache_fills_misses_from_primary(redis_cache):
+    replica_loader = AsyncMock(return_value="replica")
+    primary_loader = AsyncMock(return_value="primary")
+    cache = ReplicaCache(redis_cache)
+
+    values = await asyncio.gather(
+        *(cache.get_or_load("menus", replica_loader, refresher=primary_loader) for _ in range(5))
+    )
+
+    assert values == ["primary"] * 5
+    primary_loader.assert_awaited_once()
+    replica_loader.assert_not_awaited()
+    assert await redis_cache.get_or_none("menus") == "primary"
+
+
+@pytest.mark.asyncio
+async def test_two_tier_cache_flush_notifies_other_processes():
+    redis_client = AsyncMock()
+    local_cache = LocalCache(max_size=2, ttl=10)
+    local_cache.set("menus", [])
+    cache = TwoTierCache(cache_client=redis_client, local_cache=local_cache)
+
+    await cache.flush()
+
+    assert local_cache.get("menus") is None
+    redis_client.flushdb.assert_awaited_once()
+    redis_client.publish.assert_awaited_once_with(INVALIDATION_CHANNEL, f"{INSTANCE_ID}:*")
+
+
+@pytest.mark.parametrize("name", ["orjson", "msgpack"])
+def test_serializer_matches_json_output(name):
+    pytest.importorskip(name)
+    MenuRow = result_tuple(["id", "title"])
+    menus = [MenuRow((uuid.uuid4(), "Main menu"))]
+    serializer = get_serializer(name)
+    json_serializer = JSONSerializer()
+
+    assert serializer.loads(serializer.dumps(menus)) == json_serializer.loads(json_serializer.dumps(menus))
+
+
+@pytest.mark.parametrize("name", ["orjson", "msgpack"])
+def test_serializer_without_package_fails_clearly(name, monkeypatch):
+    monkeypatch.setitem(sys.modules, name, None)
+
+    with pytest.raises(ValueError, match=f"poetry install -E {name}"):
+        get_serializer(name)
+
+
+@pytest.mark.asyncio
+async def test_single_flight_runs_loader_once():
+    calls = 0
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "menus"
+
+    results = await asyncio.gather(*(single_flight("menus", load) for _ in range(5)))
+    assert calls == 1
+    assert results == ["menus"] * 5
+
+
+def test_circuit_breaker_opens_and_half_opens():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10)
+    with patch("restaurant_menu_app.db.cache.circuit_breaker.time.monotonic", return_value=0):
+        breaker.record_failure()
+        assert breaker.allow_request()
+        breaker.record_failure()
+        assert not breaker.allow_request()
+    with patch("restaurant_menu_app.db.cache.circuit_breaker.time.monotonic", return_value=11):
+        assert breaker.allow_request()
+        breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_fallback_cache_loads_from_database_when_cache_is_down():
+    cache = AsyncMock()
+    cache.get_or_load.side_effect = ConnectionError
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    fallback_cache = FallbackCache(cache, breaker)
+
+    async def loader():
+        return "menus"
+
+    assert await fallback_cache.get_or_load("menus", loader) == "menus"
+    assert breaker.state == CircuitBreaker.OPEN
+    assert await fallback_cache.get_or_load("menus", loader) == "menus"
+    assert cache.get_or_load.await_count == 1
@@ -0,0 +1,44 @@
+import json
+import uuid
+
+from restaurant_menu_app.services.cache_warm_up import build_cache_entries
+
+
+def test_warm_up_fills_list_and_detail_keys():
+    menu_id, soups_id, empty_id, dish_id = (str(uuid.uuid4()) for _ in range(4))
+    tree = [
+        {
+            "menu_id": menu_id,
+            "menu_title": "Main menu",
+            "menu_description": "our main menu",
+            "child_submenus": [
+                {
+                    "submenu_id": soups_id,
+                    "submenu_title": "Soups",
+                    "submenu_description": "just soups",
+                    "child_dishes": [
+                        {
+                            "dish_id": dish_id,
+                            "dish_title": "Borsh",
+                            "dish_description": "best borsh",
+                            "dish_price": 300,
+                        },
+                    ],
+                },
+                {
+                    "submenu_id": empty_id,
+                    "submenu_title": "Empty",
+                    "submenu_description": "no dishes",
+                    "child_dishes": None,
+                },
+            ],
+        },
+    ]
+    entries = {key: json.loads(value) for group in build_cache_entries(tree).values() for key, value in group.items()}
+
+    assert entries["menus"][0]["submenus_count"] == 2
+    assert entries["menus"][0]["dishes_count"] == 1
+    assert entries[f"menu:{menu_id}"] == entries["menus"][0]
+    assert len(entries[f"menu:{menu_id}:submenus"]) == 2
+    assert entries[f"menu:{menu_id}:submenu:{empty_id}:dishes"] == []
+    assert entries[f"menu:{menu_id}:submenu:{soups_id}:dish:{dish_id}"]["price"] == "300.00"
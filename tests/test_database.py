@@ -0,0 +1,92 @@
+from contextlib import asynccontextmanager
+from unittest.mock import Mock, patch
+
+import pytest
+from fastapi import Request, Response
+from sqlalchemy.pool import NullPool
+from sqlalchemy.util import greenlet_spawn
+
+from restaurant_menu_app.db.main_db import database
+from restaurant_menu_app.services.metrics import metrics
+
+REPLICA = object()
+PRIMARY = object()
+
+
+@asynccontextmanager
+async def replica_session():
+    yield REPLICA
+
+
+def make_request(method: str, cookie: str = "") -> Request:
+    headers = [(b"cookie", cookie.encode())] if cookie else []
+    return Request({"type": "http", "method": method, "headers": headers})
+
+
+async def resolve_read_db(request: Request):
+    generator = database.get_read_db(request, PRIMARY)
+    session = await generator.__anext__()
+    await generator.aclose()
+    return session
+
+
+def test_engine_options_with_null_pool():
+    with patch.object(database, "DB_NULL_POOL", True):
+        options = database.get_engine_options()
+
+    assert options["poolclass"] is NullPool
+    assert "pool_size" not in options
+
+
+def test_engine_options_with_queue_pool():
+    with patch.object(database, "DB_NULL_POOL", False):
+        options = database.get_engine_options()
+
+    assert options["poolclass"] is database.TimedQueuePool
+    assert options["pool_size"] == database.DB_POOL_SIZE
+    assert options["max_overflow"] == database.DB_MAX_OVERFLOW
+    assert options["pool_timeout"] == database.DB_POOL_TIMEOUT
+    assert options["pool_recycle"] == database.DB_POOL_RECYCLE
+    assert options["pool_pre_ping"] == database.DB_POOL_PRE_PING
+    assert options["connect_args"] == {
+        "statement_cache_size": database.DB_STATEMENT_CACHE_SIZE,
+        "prepared_statement_cache_size": database.DB_STATEMENT_CACHE_SIZE,
+    }
+
+
+@pytest.mark.asyncio
+async def test_pool_checkout_is_timed():
+    # TimedQueuePool переопределяет закрытый _do_get: тест заметит, если SQLAlchemy перестанет его вызывать.
+    pool = database.TimedQueuePool(Mock, pool_size=1)
+    checkouts = metrics.observations.get("db_pool_checkout_seconds", {}).get("count", 0)
+
+    connection = await greenlet_spawn(pool.connect)
+    await greenlet_spawn(connection.close)
+
+    assert metrics.observations["db_pool_checkout_seconds"]["count"] == checkouts + 1
+
+
+@pytest.mark.asyncio
+async def test_read_db_uses_replica_for_reads():
+    with patch.object(database, "REPLICA_ENABLED", True), patch.object(database, "read_session", replica_session):
+        assert await resolve_read_db(make_request("GET")) is REPLICA
+        assert await resolve_read_db(make_request("POST")) is PRIMARY
+        assert await resolve_read_db(make_request("GET", f"{database.PRIMARY_PIN_COOKIE}=1")) is PRIMARY
+
+
+@pytest.mark.asyncio
+async def test_read_db_uses_primary_without_replica():
+    with patch.object(database, "REPLICA_ENABLED", False):
+        assert await resolve_read_db(make_request("GET")) is PRIMARY
+
+
+@pytest.mark.asyncio
+async def test_write_pins_client_to_primary():
+    response = Response()
+    with patch.object(database, "REPLICA_ENABLED", True):
+        generator = database.get_db(make_request("PATCH"), response)
+        await generator.__anext__()
+        await generator.aclose()
+
+    assert f"{database.PRIMARY_PIN_COOKIE}=1" in response.headers["set-cookie"]
+    assert f"Max-Age={database.DB_PRIMARY_PIN_SECONDS}" in response.headers["set-cookie"]
@@ -1,4 +1,5 @@
 from http import HTTPStatus
+from uuid import uuid4
 
 import pytest
 
@@ -42,6 +43,23 @@ async def test_post_dish(fixture_submenu, client):
     assert response.json()["price"] == dish_price
 
 
+@pytest.mark.asyncio
+async def test_post_dish_wrong_menu(fixture_submenu, client):
+    submenu_id = str(fixture_submenu[1]["id"])
+
+    response = await client.post(
+        f"/api/v1/menus/{fake_id}/submenus/{submenu_id}/dishes",
+        json=new_dish,
+    )
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {"detail": "parent submenu not found"}
+
+    response = await client.get(
+        f"/api/v1/menus/{fixture_submenu[0]}/submenus/{submenu_id}/dishes",
+    )
+    assert response.json() == []
+
+
 @pytest.mark.asyncio
 async def test_get_dishes(fixture_dish, client):
     menu_id = str(fixture_dish[0])
@@ -120,3 +138,75 @@ async def test_delete_dish(fixture_dish, client):
         f"/api/v1/menus/{menu_id}/submenus/{submenu_id}/dishes/{dish_id}",
     )
     assert response_after_delete.status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_delete_dish_wrong_menu(fixture_dish, client):
+    menu_id = str(fixture_dish[0])
+    submenu_id = str(fixture_dish[1])
+    dish_id = str(fixture_dish[2].id)
+
+    response = await client.delete(
+        f"/api/v1/menus/{uuid4()}/submenus/{submenu_id}/dishes/{dish_id}",
+    )
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert response.json() == dish_not_found
+    response_after_delete = await client.get(
+        f"/api/v1/menus/{menu_id}/submenus/{submenu_id}/dishes/{dish_id}",
+    )
+    assert response_after_delete.status_code == HTTPStatus.OK
+
+
+@pytest.mark.asyncio
+async def test_dish_counters(fixture_submenu, client):
+    menu_id = str(fixture_submenu[0])
+    submenu_id = str(fixture_submenu[1]["id"])
+
+    response = await client.post(
+        f"/api/v1/menus/{menu_id}/submenus/{submenu_id}/dishes",
+        json=new_dish,
+    )
+    dish_id = response.json()["id"]
+    menu = (await client.get(f"/api/v1/menus/{menu_id}")).json()
+    submenu = (await client.get(f"/api/v1/menus/{menu_id}/submenus/{submenu_id}")).json()
+    assert menu["submenus_count"] == 1
+    assert menu["dishes_count"] == 1
+    assert submenu["dishes_count"] == 1
+
+    await client.delete(f"/api/v1/menus/{menu_id}/submenus/{submenu_id}/dishes/{dish_id}")
+    menu = (await client.get(f"/api/v1/menus/{menu_id}")).json()
+    submenu = (await client.get(f"/api/v1/menus/{menu_id}/submenus/{submenu_id}")).json()
+    assert menu["dishes_count"] == 0
+    assert submenu["dishes_count"] == 0
+
+
+@pytest.mark.asyncio
+async def test_post_dishes_bulk(fixture_dish, client):
+    menu_id = str(fixture_dish[0])
+    submenu_id = str(fixture_dish[1])
+    other_dish = {**new_dish, "title": "Other dish"}
+
+    response = await client.post(
+        f"/api/v1/menus/{menu_id}/submenus/{submenu_id}/dishes:bulk",
+        json=[other_dish, new_dish, other_dish],
+    )
+    assert response.status_code == HTTPStatus.CREATED
+    assert [dish["title"] for dish in response.json()["created"]] == [other_dish["title"]]
+    assert [conflict["index"] for conflict in response.json()["conflicts"]] == [1, 2]
+
+    dishes = await client.get(f"/api/v1/menus/{menu_id}/submenus/{submenu_id}/dishes")
+    assert len(dishes.json()) == 2
+    submenu = await client.get(f"/api/v1/menus/{menu_id}/submenus/{submenu_id}")
+    assert submenu.json()["dishes_count"] == 2
+
+
+@pytest.mark.asyncio
+async def test_post_dishes_bulk_wrong_menu(fixture_dish, client):
+    submenu_id = str(fixture_dish[1])
+
+    response = await client.post(
+        f"/api/v1/menus/{fake_id}/submenus/{submenu_id}/dishes:bulk",
+        json=[{**new_dish, "title": "Other dish"}],
+    )
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {"detail": "parent submenu not found"}
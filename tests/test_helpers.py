@@ -0,0 +1,184 @@
+import uuid
+from http import HTTPStatus
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+import pytest_asyncio
+from fastapi.responses import FileResponse
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from restaurant_menu_app.db.main_db.crud.helpers import HelperCRUD
+from restaurant_menu_app.db.main_db.crud.menus import MenuCRUD
+from restaurant_menu_app.db.main_db.database import Base, get_db
+from restaurant_menu_app.main import app
+from restaurant_menu_app.schemas import scheme
+from restaurant_menu_app.services import helper
+from tests.fixtures.dishes_fixtures import new_dish
+from tests.fixtures.menus_fixtures import new_menu
+
+
+@pytest.mark.asyncio
+async def test_generate_test_data(client):
+    response = await client.post(
+        "/api/v1/generated_test_data",
+        params={"menus": 2, "submenus": 2, "dishes": 3},
+    )
+    assert response.status_code == HTTPStatus.CREATED
+
+    menus = (await client.get("/api/v1/menus")).json()
+    assert len(menus) == 2
+    assert all(menu["submenus_count"] == 2 for menu in menus)
+    assert all(menu["dishes_count"] == 6 for menu in menus)
+
+
+@pytest.mark.asyncio
+async def test_generate_test_data_too_large(client):
+    response = await client.post(
+        "/api/v1/generated_test_data",
+        params={"menus": 1000, "submenus": 1000, "dishes": 1000},
+    )
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+@pytest.mark.asyncio
+async def test_generate_test_data_limits_every_level(client):
+    response = await client.post(
+        "/api/v1/generated_test_data",
+        params={"menus": 1000, "submenus": 1000, "dishes": 0},
+    )
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+@pytest.mark.asyncio
+async def test_counter_triggers_work_after_generation(client):
+    await client.post(
+        "/api/v1/generated_test_data",
+        params={"menus": 1, "submenus": 1, "dishes": 1},
+    )
+    menu_id = (await client.get("/api/v1/menus")).json()[0]["id"]
+    submenu_id = (await client.get(f"/api/v1/menus/{menu_id}/submenus")).json()[0]["id"]
+
+    await client.post(f"/api/v1/menus/{menu_id}/submenus/{submenu_id}/dishes", json=new_dish)
+
+    menu = (await client.get(f"/api/v1/menus/{menu_id}")).json()
+    assert menu["dishes_count"] == 2
+
+
+@pytest.mark.asyncio
+async def test_catalog_revision(db, client):
+    helper_crud = HelperCRUD(db)
+    revision = await helper_crud.get_revision()
+
+    response = await client.post("/api/v1/menus", json=new_menu)
+    assert await helper_crud.get_revision() > revision
+
+    revision = await helper_crud.get_revision()
+    await client.delete(f"/api/v1/menus/{response.json()['id']}")
+    assert await helper_crud.get_revision() > revision
+
+
+@pytest.mark.asyncio
+async def test_catalog_revision_ignores_statements_without_rows(db, client):
+    helper_crud = HelperCRUD(db)
+    revision = await helper_crud.get_revision()
+
+    response = await client.delete(f"/api/v1/menus/{uuid.uuid4()}")
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert await helper_crud.get_revision() == revision
+
+
+@pytest.mark.asyncio
+async def test_create_all_on_existing_schema(db):
+    connection = await db.connection()
+
+    await connection.run_sync(Base.metadata.create_all)
+
+
+@pytest_asyncio.fixture
+async def snapshot_client(db_engine):
+    """Клиент над тестовой транзакцией REPEATABLE READ.
+
+    Выгрузка переводит свою транзакцию в REPEATABLE READ, а уровень уже начатой тестовой транзакции не поменять.
+    """
+
+    connection = await db_engine.connect()
+    connection = await connection.execution_options(isolation_level="REPEATABLE READ")
+    transaction = await connection.begin()
+    db = AsyncSession(bind=connection)
+    app.dependency_overrides[get_db] = lambda: db
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        yield client
+
+    await transaction.rollback()
+    await connection.close()
+
+
+@pytest.mark.asyncio
+async def test_stream_content_as_file(snapshot_client):
+    await snapshot_client.post(
+        "/api/v1/generated_test_data",
+        params={"menus": 1, "submenus": 1, "dishes": 2},
+    )
+
+    response = await snapshot_client.get("/api/v1/content_as_file/stream", params={"format": "csv"})
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["content-type"].startswith("text/csv")
+    lines = response.text.splitlines()
+    assert lines[0].startswith("menu_id,menu_title")
+    assert len(lines) == 3
+
+
+@pytest.mark.asyncio
+async def test_stream_content_as_file_empty(snapshot_client):
+    response = await snapshot_client.get("/api/v1/content_as_file/stream", params={"format": "csv"})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+@pytest.mark.asyncio
+async def test_stream_reads_one_snapshot(db_engine):
+    async with AsyncSession(db_engine) as read_db, AsyncSession(db_engine) as db:
+        helper_crud = HelperCRUD(db=read_db)
+        await helper_crud.begin_snapshot()
+        assert not await helper_crud.has_menus()
+
+        menu = await MenuCRUD(db).create(scheme.MenuCreate(**new_menu))
+        try:
+            assert not await helper_crud.has_menus()
+            assert await helper_crud.count_dishes() == 0
+            assert [record async for record in helper_crud.stream_records()] == []
+        finally:
+            await MenuCRUD(db).delete(menu.id)
+
+
+@pytest.fixture
+def unknown_task(monkeypatch, tmp_path):
+    """Задача, которую rpc-бэкенд этого процесса не знает, например отправленная до перезапуска."""
+
+    task = Mock(state="PENDING", status="PENDING")
+    task.successful.return_value = False
+    monkeypatch.setattr(helper.tasks, "get_result", lambda task_id: task)
+    monkeypatch.setattr(helper, "export_file_path", tmp_path.joinpath)
+    return task
+
+
+def test_pending_export_is_reused_only_with_its_file(unknown_task, tmp_path):
+    assert not helper.is_reusable_export("task", "restaurant_menu_r1.csv")
+
+    tmp_path.joinpath("restaurant_menu_r1.csv").touch()
+    assert helper.is_reusable_export("task", "restaurant_menu_r1.csv")
+
+
+@pytest.mark.asyncio
+async def test_export_file_is_served_for_unknown_task(unknown_task, tmp_path):
+    cache = AsyncMock()
+    cache.get_or_none.return_value = "restaurant_menu_r1.csv"
+    helper_service = helper.HelperServise(db=Mock(), helper_crud=Mock(), cache=cache)
+
+    assert await helper_service.get_all_data_in_file("task") == {"task_id": "task", "status": "PENDING"}
+
+    tmp_path.joinpath("restaurant_menu_r1.csv").touch()
+    response = await helper_service.get_all_data_in_file("task")
+    assert isinstance(response, FileResponse)
+    assert response.path == str(tmp_path.joinpath("restaurant_menu_r1.csv"))
@@ -0,0 +1,73 @@
+import json
+
+import pytest
+from sqlalchemy import event, text
+
+from restaurant_menu_app.db.main_db.crud.dishes import DishCRUD
+from restaurant_menu_app.db.main_db.crud.submenus import SubmenuCRUD
+
+
+def plan_nodes(plan: dict):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+async def explain(db, crud_call) -> list[dict]:
+    """Перехватить SQL, который отправляет в базу метод CRUD, и вернуть узлы его плана."""
+
+    connection = await db.connection()
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(connection.sync_connection, "before_cursor_execute", capture)
+    try:
+        await crud_call()
+    finally:
+        event.remove(connection.sync_connection, "before_cursor_execute", capture)
+
+    # На паре строк планировщик честно выбирает Seq Scan, поэтому проверяем, что индекс вообще применим.
+    await db.execute(text("SET LOCAL enable_seqscan = off"))
+    statement, parameters = statements[-1]
+    result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return list(plan_nodes(plan[0]["Plan"]))
+
+
+def index_names(nodes: list[dict], table: str) -> set[str | None]:
+    """Индексы, которыми читается таблица. У Bitmap Heap Scan индекс указан в дочернем Bitmap Index Scan."""
+
+    scans = [node for node in nodes if node.get("Relation Name") == table]
+    assert scans
+    names = set()
+    for scan in scans:
+        if scan["Node Type"] == "Bitmap Heap Scan":
+            names |= {child["Index Name"] for child in plan_nodes(scan) if child["Node Type"] == "Bitmap Index Scan"}
+        else:
+            names.add(scan.get("Index Name"))
+    return names
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("limit", [None, 10])
+async def test_submenus_list_uses_index(db, fixture_submenu, limit):
+    menu_id = fixture_submenu[0]
+
+    nodes = await explain(db, lambda: SubmenuCRUD(db).read_all(menu_id, limit=limit))
+
+    assert index_names(nodes, "submenus") == {"ix_submenus_menu_id"}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("limit", [None, 10])
+async def test_dishes_list_uses_index(db, fixture_dish, limit):
+    menu_id, submenu_id = fixture_dish[0], fixture_dish[1]
+
+    nodes = await explain(db, lambda: DishCRUD(db).read_all(menu_id, submenu_id, limit=limit))
+
+    assert index_names(nodes, "dishes") == {"ix_dishes_submenu_id"}
+    assert not any(node["Node Type"] == "Seq Scan" for node in nodes)
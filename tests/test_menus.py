@@ -52,6 +52,16 @@ async def test_get_menu(fixture_menu, client):
     assert response.json()["description"] == menu_description
 
 
+@pytest.mark.asyncio
+async def test_get_menu_from_cache(fixture_menu, client):
+    menu_id = str(fixture_menu["id"])
+
+    response = await client.get(f"/api/v1/menus/{menu_id}")
+    cached_response = await client.get(f"/api/v1/menus/{menu_id}")
+    assert cached_response.status_code == HTTPStatus.OK
+    assert cached_response.json() == response.json()
+
+
 @pytest.mark.asyncio
 async def test_get_menu_not_found(client):
     response = await client.get(f"/api/v1/menus/{fake_id}")
@@ -72,6 +82,13 @@ async def test_patch_menu(fixture_menu, client):
     assert response.json()["description"] == menu_description
 
 
+@pytest.mark.asyncio
+async def test_patch_menu_not_found(client):
+    response = await client.patch(f"/api/v1/menus/{fake_id}", json=upd_menu)
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert response.json() == menu_not_found
+
+
 @pytest.mark.asyncio
 async def test_delete_menu(fixture_menu, client):
     menu_id = str(fixture_menu["id"])
@@ -81,3 +98,77 @@ async def test_delete_menu(fixture_menu, client):
     assert response.json() == menu_deleted
     response_after_delete = await client.get(f"/api/v1/menus/{menu_id}")
     assert response_after_delete.status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_get_menus_paginated(client):
+    for number in range(3):
+        await client.post("/api/v1/menus", json={"title": f"Menu {number}", "description": "paged"})
+
+    first_page = await client.get("/api/v1/menus", params={"limit": 2})
+    assert first_page.status_code == HTTPStatus.OK
+    assert len(first_page.json()) == 2
+    cursor = first_page.headers["X-Next-Cursor"]
+
+    second_page = await client.get("/api/v1/menus", params={"limit": 2, "cursor": cursor})
+    assert second_page.status_code == HTTPStatus.OK
+    assert len(second_page.json()) == 1
+    assert "X-Next-Cursor" not in second_page.headers
+
+    ids = [menu["id"] for menu in first_page.json() + second_page.json()]
+    assert sorted(ids) == sorted(menu["id"] for menu in (await client.get("/api/v1/menus")).json())
+
+
+@pytest.mark.asyncio
+async def test_get_menus_page_invalidated_on_create(client):
+    await client.post("/api/v1/menus", json=new_menu)
+    assert len((await client.get("/api/v1/menus", params={"limit": 10})).json()) == 1
+
+    await client.post("/api/v1/menus", json=upd_menu)
+    assert len((await client.get("/api/v1/menus", params={"limit": 10})).json()) == 2
+
+
+@pytest.mark.asyncio
+async def test_get_menus_invalid_cursor(client):
+    response = await client.get("/api/v1/menus", params={"limit": 2, "cursor": "not-a-cursor"})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {"detail": "invalid cursor"}
+
+
+@pytest.mark.asyncio
+async def test_get_menus_tree(fixture_dish, client):
+    menu_id = str(fixture_dish[0])
+    dish_id = str(fixture_dish[2].id)
+
+    response = await client.get("/api/v1/menus/tree")
+    assert response.status_code == HTTPStatus.OK
+    tree = response.json()
+    assert [menu["id"] for menu in tree] == [menu_id]
+    assert tree[0]["dishes_count"] == 1
+    assert tree[0]["submenus"][0]["dishes"][0]["id"] == dish_id
+
+    menu_tree = await client.get(f"/api/v1/menus/{menu_id}/tree")
+    assert menu_tree.status_code == HTTPStatus.OK
+    assert menu_tree.json() == tree[0]
+
+
+@pytest.mark.asyncio
+async def test_get_menus_tree_invalidated_on_write(fixture_dish, client):
+    menu_id = str(fixture_dish[0])
+    submenu_id = str(fixture_dish[1])
+    dish_id = str(fixture_dish[2].id)
+    await client.get("/api/v1/menus/tree")
+
+    await client.patch(
+        f"/api/v1/menus/{menu_id}/submenus/{submenu_id}/dishes/{dish_id}",
+        json={"title": "Renamed dish"},
+    )
+    tree = (await client.get("/api/v1/menus/tree")).json()
+    assert tree[0]["submenus"][0]["dishes"][0]["title"] == "Renamed dish"
+
+
+@pytest.mark.asyncio
+async def test_get_menu_tree_not_found(client):
+    response = await client.get(f"/api/v1/menus/{fake_id}/tree")
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert response.json() == menu_not_found
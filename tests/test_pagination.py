@@ -0,0 +1,41 @@
+import json
+import uuid
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.engine.result import result_tuple
+
+from restaurant_menu_app.schemas.scheme import MenuInfo
+from restaurant_menu_app.services.pagination import (
+    NEXT_CURSOR_HEADER,
+    decode_cursor,
+    encode_cursor,
+    load_page,
+    unpack_page,
+)
+
+
+def test_cursor_round_trip():
+    menu_id = str(uuid.uuid4())
+
+    assert decode_cursor(encode_cursor(menu_id)) == menu_id
+    assert decode_cursor(None) is None
+    with pytest.raises(HTTPException):
+        decode_cursor("not-a-cursor")
+
+
+@pytest.mark.asyncio
+async def test_load_page_sets_next_cursor_only_when_rows_remain():
+    make_row = result_tuple(["id", "title", "description", "submenus_count", "dishes_count"])
+    rows = [make_row((uuid.uuid4(), f"Menu {number}", "paged", 0, 0)) for number in range(3)]
+    read_all = AsyncMock(side_effect=lambda limit, after: rows[:limit])
+
+    body, headers = unpack_page(await load_page(list[MenuInfo], read_all, 2, None))
+    assert [menu["id"] for menu in json.loads(body)] == [str(row.id) for row in rows[:2]]
+    assert decode_cursor(headers[NEXT_CURSOR_HEADER]) == str(rows[1].id)
+    read_all.assert_awaited_with(3, None)
+
+    body, headers = unpack_page(await load_page(list[MenuInfo], read_all, 3, None))
+    assert len(json.loads(body)) == 3
+    assert headers == {}
@@ -0,0 +1,13 @@
+import json
+import uuid
+
+from restaurant_menu_app.schemas.scheme import MenuInfo
+from restaurant_menu_app.services.responses import render
+
+
+def test_render_matches_json_response():
+    menu = {"id": str(uuid.uuid4()), "title": "Меню", "description": "", "submenus_count": 0, "dishes_count": 0}
+
+    body = render(MenuInfo, menu)
+    assert json.loads(body) == menu
+    assert "Меню".encode() in body
@@ -5,6 +5,7 @@ import pytest
 from tests.fixtures.submenus_fixtures import (
     fake_id,
     new_submenu,
+    other_menu_data,
     submenu_deleted,
     submenu_not_found,
     upd_submenu,
@@ -46,6 +47,19 @@ async def test_get_submenus(fixture_submenu, client):
     assert len(response.json()) == 1
 
 
+@pytest.mark.asyncio
+async def test_get_submenus_cached_per_menu(fixture_submenu, client):
+    menu_id = fixture_submenu[0]
+    other_menu = await client.post("/api/v1/menus", json=other_menu_data)
+    other_menu_id = other_menu.json()["id"]
+
+    response = await client.get(f"/api/v1/menus/{menu_id}/submenus")
+    other_response = await client.get(f"/api/v1/menus/{other_menu_id}/submenus")
+    assert len(response.json()) == 1
+    assert other_response.status_code == HTTPStatus.OK
+    assert other_response.json() == []
+
+
 @pytest.mark.asyncio
 async def test_get_submenu(fixture_submenu, client):
     menu_id = str(fixture_submenu[0])
@@ -100,3 +114,32 @@ async def test_delete_submenu(fixture_submenu, client):
         f"/api/v1/menus/{menu_id}/submenus/{submenu_id}",
     )
     assert response_after_delete.status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_post_submenus_bulk(fixture_submenu, client):
+    menu_id = str(fixture_submenu[0])
+
+    response = await client.post(
+        f"/api/v1/menus/{menu_id}/submenus:bulk",
+        json=[upd_submenu, new_submenu],
+    )
+    assert response.status_code == HTTPStatus.CREATED
+    assert [submenu["title"] for submenu in response.json()["created"]] == [upd_submenu["title"]]
+    assert response.json()["conflicts"] == [
+        {"index": 1, "title": new_submenu["title"], "detail": "Submenu with that title already exists"},
+    ]
+
+    menu = await client.get(f"/api/v1/menus/{menu_id}")
+    assert menu.json()["submenus_count"] == 2
+
+    created_id = response.json()["created"][0]["id"]
+    submenu = await client.get(f"/api/v1/menus/{menu_id}/submenus/{created_id}")
+    assert submenu.json()["title"] == upd_submenu["title"]
+
+
+@pytest.mark.asyncio
+async def test_post_submenus_bulk_menu_not_found(client):
+    response = await client.post(f"/api/v1/menus/{fake_id}/submenus:bulk", json=[new_submenu])
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {"detail": "parent menu not found"}
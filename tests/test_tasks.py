@@ -0,0 +1,112 @@
+import csv
+import json
+import os
+from collections import namedtuple
+
+import openpyxl
+import pyarrow.parquet as pq
+import pytest
+
+from restaurant_menu_app.tasks.tasks import export_file_name, prune_exports
+from restaurant_menu_app.tasks.writers import (
+    ExportFormat,
+    save_to_csv,
+    save_to_jsonl,
+    save_to_parquet,
+    save_to_xlsx,
+)
+
+Record = namedtuple(
+    "Record",
+    [
+        "menu_id",
+        "menu_title",
+        "menu_description",
+        "submenu_id",
+        "submenu_title",
+        "submenu_description",
+        "dish_id",
+        "dish_title",
+        "dish_description",
+        "dish_price",
+    ],
+)
+
+
+RECORDS = [
+    Record("m1", "Menu", "Menu", "s1", "Submenu", "Submenu", "d1", "Dish", "Dish", 12.5),
+    Record("m1", "Menu", "Menu", "s2", "Empty", "Empty", None, None, None, None),
+    Record("m2", "Empty", "Empty", None, None, None, None, None, None, None),
+]
+
+
+async def stream(records):
+    for record in records:
+        yield record
+
+
+@pytest.mark.asyncio
+async def test_save_to_xlsx(tmp_path):
+    file_name = tmp_path / "menu.xlsx"
+
+    await save_to_xlsx(stream(RECORDS), str(file_name))
+
+    rows = list(openpyxl.load_workbook(file_name).active.iter_rows(values_only=True))
+    assert rows == [
+        (1, "Menu", "Menu", None, None, None),
+        (None, 1, "Submenu", "Submenu", None, None),
+        (None, None, 1, "Dish", "Dish", 12.5),
+        (None, 2, "Empty", "Empty", None, None),
+        (2, "Empty", "Empty", None, None, None),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_save_to_csv(tmp_path):
+    file_name = tmp_path / "menu.csv"
+
+    await save_to_csv(stream(RECORDS), str(file_name))
+
+    with open(file_name, newline="", encoding="utf-8") as file:
+        rows = list(csv.reader(file))
+    assert rows[0] == list(Record._fields)
+    assert rows[1] == ["m1", "Menu", "Menu", "s1", "Submenu", "Submenu", "d1", "Dish", "Dish", "12.5"]
+    assert rows[3] == ["m2", "Empty", "Empty", "", "", "", "", "", "", ""]
+
+
+@pytest.mark.asyncio
+async def test_save_to_jsonl(tmp_path):
+    file_name = tmp_path / "menu.jsonl"
+
+    await save_to_jsonl(stream(RECORDS), str(file_name))
+
+    with open(file_name, encoding="utf-8") as file:
+        rows = [json.loads(line) for line in file]
+    assert rows == [record._asdict() for record in RECORDS]
+
+
+@pytest.mark.asyncio
+async def test_save_to_parquet(tmp_path):
+    file_name = tmp_path / "menu.parquet"
+
+    await save_to_parquet(stream(RECORDS), str(file_name), batch_size=2)
+
+    parquet_file = pq.ParquetFile(file_name)
+    assert parquet_file.metadata.num_row_groups == 2
+    assert parquet_file.read().column("dish_title").to_pylist() == ["Dish", None, None]
+
+
+def test_prune_exports(tmp_path):
+    for revision in range(5):
+        for export_format in (ExportFormat.xlsx, ExportFormat.csv):
+            path = tmp_path / export_file_name(revision, export_format)
+            path.touch()
+            os.utime(path, (revision, revision))
+
+    prune_exports(tmp_path, ExportFormat.xlsx, keep=2)
+
+    assert sorted(path.name for path in tmp_path.glob("*.xlsx")) == [
+        export_file_name(3, ExportFormat.xlsx),
+        export_file_name(4, ExportFormat.xlsx),
+    ]
+    assert len(list(tmp_path.glob("*.csv"))) == 5